@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from skillrot_app.db.database import get_db
+from skillrot_app.core.etag import make_etag, etag_matches, not_modified, set_etag
 from skillrot_app.models.skill import Skill
 from skillrot_app.models.skill_history import SkillHistory
 from skillrot_app.core.skill_analyzer import classify_skill
-from skillrot_app.services.decay_service import recalculate_skill_decay
+from skillrot_app.services.decay_service import recalculate_skill_decay, compute_skill_health
 
 router = APIRouter(prefix="/analysis", tags=["Skill Analysis"])
 
@@ -12,12 +14,23 @@ router = APIRouter(prefix="/analysis", tags=["Skill Analysis"])
 # Skill Health API
 # -------------------------
 @router.get("/skills/{skill_id}/health")
-def get_skill_health(skill_id: int, db: Session = Depends(get_db)):
+def get_skill_health(
+    skill_id: int,
+    db: Session = Depends(get_db),
+    persist: bool = False
+):
+    """
+    Read-only by default. Pass persist=true to also store
+    today's health snapshot (same as /refresh).
+    """
     skill = db.query(Skill).filter(Skill.id == skill_id).first()
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
 
-    score = recalculate_skill_decay(skill, db)
+    if persist:
+        score = recalculate_skill_decay(skill, db)
+    else:
+        score = compute_skill_health(skill, db)
     status = classify_skill(score)
 
     return {
@@ -30,13 +43,26 @@ def get_skill_health(skill_id: int, db: Session = Depends(get_db)):
 # Decay Curve API
 # -------------------------
 @router.get("/skills/{skill_id}/decay-curve")
-def get_decay_curve(skill_id: int, db: Session = Depends(get_db)):
+def get_decay_curve(
+    skill_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     skill = db.query(Skill).filter(Skill.id == skill_id).first()
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
 
-    # Ensure decay exists
-    recalculate_skill_decay(skill, db)
+    # History rows are append-only: newest id + count identify the curve
+    version = (
+        db.query(func.max(SkillHistory.id), func.count(SkillHistory.id))
+        .filter(SkillHistory.skill_id == skill_id)
+        .one()
+    )
+
+    etag = make_etag("decay-curve", skill_id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
     history = (
         db.query(SkillHistory)
@@ -45,6 +71,8 @@ def get_decay_curve(skill_id: int, db: Session = Depends(get_db)):
         .all()
     )
 
+    set_etag(response, etag)
+
     return [
         {"date": h.date, "score": h.decay_score}
         for h in history
@@ -6,7 +6,9 @@ from skillrot_app.models.subtopic import Subtopic
 
 from skillrot_app.services.file_parser_service import extract_text_from_file
 from skillrot_app.services.assessment_analyzer_service import analyze_assessment_text
+from skillrot_app.services.user_version_service import bump_user_version
 
+from datetime import date
 import json
 
 router = APIRouter(prefix="/assessment", tags=["Assessment"])
@@ -47,6 +49,7 @@ async def upload_assessment(
             skill_id=skill_id,
             parsed_result=json.dumps({})
         ))
+        bump_user_version(db, skill_id=skill_id)
         db.commit()
 
         return {
@@ -77,11 +80,13 @@ async def upload_assessment(
 
         if existing:
             existing.health_score = health_value
+            existing.anchored_on = date.today()
         else:
             db.add(Subtopic(
                 skill_id=skill_id,
                 name=topic,
-                health_score=health_value
+                health_score=health_value,
+                anchored_on=date.today()
             ))
 
     # Store raw analysis result
@@ -90,6 +95,8 @@ async def upload_assessment(
         parsed_result=json.dumps(weak_topics)
     ))
 
+    bump_user_version(db, skill_id=skill_id)
+
     db.commit()
 
     return {
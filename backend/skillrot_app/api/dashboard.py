@@ -1,76 +1,151 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date
 
-from skillrot_app.db.database import get_db
+from skillrot_app.db.database import get_db, SessionLocal
+from skillrot_app.core.config import settings
+from skillrot_app.core.cache import CachedLoader
+from skillrot_app.core.etag import make_etag, etag_matches, not_modified, set_etag
 from skillrot_app.models.user import User
 from skillrot_app.models.skill import Skill
-from skillrot_app.models.skill_history import SkillHistory
-from skillrot_app.models.reminder import Reminder
-from skillrot_app.models.skill_health_history import SkillHealthHistory
-from skillrot_app.services.decay_service import recalculate_skill_decay
-from skillrot_app.core.skill_analyzer import classify_skill
+from skillrot_app.services.decay_service import bulk_recalculate_skill_decay
+from skillrot_app.services.dashboard_service import (
+    get_user_dashboard_data,
+    paginate_dashboard,
+    iter_user_dashboard,
+    DASHBOARD_SORTS,
+    STREAM_SORTS
+)
+from skillrot_app.services.subtopic_service import get_user_subtopic_health
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# Keyed by (user_id, data_version, day): writes bump the version,
+# the calendar day rolling over changes health.
+dashboard_cache = CachedLoader(
+    maxsize=settings.DASHBOARD_CACHE_SIZE,
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
+
+MAX_PAGE_SIZE = 500
 
-@router.get("/user/{user_id}")
-def get_user_dashboard(user_id: int, db: Session = Depends(get_db)):
+
+def _get_user(user_id: int, db: Session) -> User:
 
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    skills = db.query(Skill).filter(Skill.user_id == user_id).all()
+    return user
+
 
-    result = []
+def _cached_dashboard(user: User, db: Session) -> list:
 
-    for skill in skills:
+    key = (user.id, user.data_version, date.today())
 
-        health = recalculate_skill_decay(skill, db)
-        status = classify_skill(health)
+    return dashboard_cache.get_or_compute(
+        key,
+        lambda: get_user_dashboard_data(user.id, db)
+    )
 
-        # Last practiced
-        last_entry = (
-            db.query(SkillHistory)
-            .filter(SkillHistory.skill_id == skill.id)
-            .order_by(SkillHistory.date.desc())
-            .first()
+
+def _check_sort(sort: str, allowed: tuple):
+
+    if sort not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort '{sort}'. Valid sorts: {', '.join(allowed)}"
         )
 
-        last_practiced = last_entry.date if last_entry else skill.learned_date
 
-        # Trend
-        history = (
-            db.query(SkillHealthHistory)
-            .filter(SkillHealthHistory.skill_id == skill.id)
-            .order_by(SkillHealthHistory.recorded_at.desc())
-            .limit(2)
+@router.get("/user/{user_id}")
+def get_user_dashboard(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    persist: bool = False
+):
+
+    user = _get_user(user_id, db)
+
+    if persist:
+        skills = (
+            db.query(Skill.id, Skill.level, Skill.learned_date)
+            .filter(Skill.user_id == user_id)
             .all()
         )
+        bulk_recalculate_skill_decay(skills, db)
 
-        trend = "stable"
-        if len(history) == 2:
-            if history[0].health > history[1].health:
-                trend = "up"
-            elif history[0].health < history[1].health:
-                trend = "down"
-
-        # Reminder count
-        reminder_count = (
-            db.query(Reminder)
-            .filter(Reminder.skill_id == skill.id)
-            .count()
-        )
+    # Same inputs as the cache key, so a match skips the cache entirely
+    etag = make_etag("dashboard", user.id, user.data_version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return _cached_dashboard(user, db)
+
+
+@router.get("/user/{user_id}/page")
+def get_user_dashboard_page(
+    user_id: int,
+    db: Session = Depends(get_db),
+    sort: str = "id",
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None
+):
+    """
+    Cursor-paginated dashboard. Pass the returned `next_cursor` to
+    get the following page; it is null on the last page.
+
+    - **sort**: id, name, health (ascending) or status (Critical first)
+    """
+
+    _check_sort(sort, DASHBOARD_SORTS)
+
+    user = _get_user(user_id, db)
+
+    try:
+        return paginate_dashboard(_cached_dashboard(user, db), sort, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/user/{user_id}/stream")
+def stream_user_dashboard(
+    user_id: int,
+    db: Session = Depends(get_db),
+    sort: str = "id"
+):
+    """
+    NDJSON dashboard: one skill per line, read through a server-side
+    cursor so large portfolios never sit in memory at once.
+
+    - **sort**: id or name
+    """
+
+    _check_sort(sort, STREAM_SORTS)
+
+    _get_user(user_id, db)
+
+    def lines():
+        # The request session is closed once the handler returns
+        session = SessionLocal()
+        try:
+            for entry in iter_user_dashboard(user_id, session, sort):
+                yield json.dumps(jsonable_encoder(entry)) + "\n"
+        finally:
+            session.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/user/{user_id}/subtopics")
+def get_user_subtopics(user_id: int, db: Session = Depends(get_db)):
+
+    _get_user(user_id, db)
 
-        result.append({
-            "skill_id": skill.id,
-            "skill": skill.name,
-            "health": health,
-            "status": status,
-            "trend": trend,
-            "last_practiced": last_practiced,
-            "reminders": reminder_count
-        })
-
-    return result
\ No newline at end of file
+    return get_user_subtopic_health(user_id, db)
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from skillrot_app.db.database import get_db
-from skillrot_app.services.growth_service import get_growth_data
+from skillrot_app.core.etag import make_etag, etag_matches, not_modified, set_etag
+from skillrot_app.services.growth_service import (
+    get_growth_data,
+    get_growth_version,
+    GROWTH_BUCKETS
+)
 
 router = APIRouter(
     prefix="/growth",
@@ -9,9 +15,46 @@ router = APIRouter(
 )
 
 @router.get("/skills/{skill_id}")
-def get_skill_growth(skill_id: int, db: Session = Depends(get_db)):
+def get_skill_growth(
+    skill_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    start: date | None = Query(default=None, alias="from"),
+    end: date | None = Query(default=None, alias="to"),
+    bucket: str | None = None,
+    points: int | None = Query(default=None, ge=3, le=5000)
+):
+    """
+    Health history for a skill.
+
+    - **from** / **to**: inclusive date range
+    - **bucket**: day, week or month averages
+    - **points**: downsample (LTTB) to at most this many points
+    """
+
+    if bucket is not None and bucket not in GROWTH_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid bucket '{bucket}'. Valid buckets: {', '.join(GROWTH_BUCKETS)}"
+        )
+
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    version = get_growth_version(skill_id, db)
+
+    if version is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Skill not found"
+        )
+
+    etag = make_etag("growth", skill_id, *version, start, end, bucket, points)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    data = get_growth_data(skill_id, db)
+    data = get_growth_data(skill_id, db, start, end, bucket, points)
 
     if not data:
         raise HTTPException(
@@ -19,4 +62,5 @@ def get_skill_growth(skill_id: int, db: Session = Depends(get_db)):
             detail="Skill not found"
         )
 
+    set_etag(response, etag)
     return data
\ No newline at end of file
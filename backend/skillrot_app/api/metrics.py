@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Response
+from skillrot_app.core.metrics import render_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint: per-router latency, SQL statement
+    counts / time per request, pool checkout wait, scheduler jobs.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
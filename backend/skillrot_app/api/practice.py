@@ -5,8 +5,10 @@ from datetime import date
 from skillrot_app.db.database import get_db
 from skillrot_app.models.skill import Skill
 from skillrot_app.models.skill_history import SkillHistory
-from skillrot_app.models.subtopic import Subtopic
 from skillrot_app.services.decay_service import recalculate_skill_decay
+from skillrot_app.services.skill_state_service import record_usage
+from skillrot_app.services.subtopic_service import boost_subtopics
+from skillrot_app.services.user_version_service import bump_user_version
 
 router = APIRouter(prefix="/practice", tags=["Practice"])
 
@@ -26,12 +28,12 @@ def practice_skill(skill_id: int, db: Session = Depends(get_db)):
     )
 
     db.add(history)
+    record_usage(skill_id, history.date, history.usage, db)
 
     # Boost subtopics
-    subtopics = db.query(Subtopic).filter(Subtopic.skill_id == skill_id).all()
-    for sub in subtopics:
-        sub.health_score = min(100, sub.health_score + 10)
-        sub.last_practiced = date.today()
+    boost_subtopics([skill_id], db)
+
+    bump_user_version(db, user_id=skill.user_id)
 
     db.commit()
 
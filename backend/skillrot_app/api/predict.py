@@ -1,25 +1,54 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, timedelta
+import numpy as np
 
 from skillrot_app.db.database import get_db
 from skillrot_app.models.skill import Skill
 from skillrot_app.models.skill_history import SkillHistory
-from skillrot_app.services.decay_service import recalculate_skill_decay
-from skillrot_app.core.decay_engine import compute_decay_score
+from skillrot_app.services.decay_service import recalculate_skill_decay, compute_skill_health
+from skillrot_app.core.decay_engine import (
+    compute_decay_score,
+    compute_decay_scores,
+    encode_levels,
+    days_until_below
+)
+from skillrot_app.core.skill_analyzer import STABLE_MIN_HEALTH, AT_RISK_MIN_HEALTH
+
+# Longest forecast returned in trajectory mode
+MAX_TRAJECTORY_DAYS = 365
 
 router = APIRouter(prefix="/predict", tags=["Prediction"])
 
 
 @router.get("/{skill_id}")
-def predict(skill_id: int, days: int = 7, db: Session = Depends(get_db)):
+def predict(
+    skill_id: int,
+    days: int = 7,
+    db: Session = Depends(get_db),
+    persist: bool = False,
+    trajectory: bool = False
+):
+    """
+    trajectory=true also returns the whole no-practice forecast for
+    days 1..N plus the day health crosses into At-Risk / Critical.
+    """
+
+    if trajectory and not 1 <= days <= MAX_TRAJECTORY_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"days must be between 1 and {MAX_TRAJECTORY_DAYS} for trajectory"
+        )
 
     skill = db.query(Skill).filter(Skill.id == skill_id).first()
     if not skill:
         raise HTTPException(status_code=404, detail="Skill not found")
 
     # 🔹 Step 1 — Get current real health
-    current_health = recalculate_skill_decay(skill, db)
+    if persist:
+        current_health = recalculate_skill_decay(skill, db)
+    else:
+        current_health = compute_skill_health(skill, db)
 
     # 🔹 Step 2 — Get last usage
     history = (
@@ -50,10 +79,44 @@ def predict(skill_id: int, days: int = 7, db: Session = Depends(get_db)):
     else:
         risk = "Low"
 
-    return {
+    result = {
         "skill": skill.name,
         "current_health": current_health,
         "predicted_health_after_days": future_health,
         "days_checked": days,
         "risk_level": risk
-    }
\ No newline at end of file
+    }
+
+    if not trajectory:
+        return result
+
+    # 🔹 Step 5 — Full curve in one vectorized pass
+    today = date.today()
+    offsets = np.arange(1, days + 1)
+
+    curve = compute_decay_scores(
+        days_since_now + offsets,
+        np.zeros(days),
+        np.repeat(encode_levels([skill.level]), days)
+    )
+
+    result["trajectory"] = [
+        {
+            "day": int(offset),
+            "date": today + timedelta(days=int(offset)),
+            "health": float(health)
+        }
+        for offset, health in zip(offsets, curve)
+    ]
+
+    # 🔹 Step 6 — Analytic threshold crossings (days from today)
+    def crossing(threshold):
+        day = days_until_below(threshold, skill.level)
+        if day is None:
+            return None
+        return max(day - days_since_now, 0)
+
+    result["at_risk_in_days"] = crossing(STABLE_MIN_HEALTH)
+    result["critical_in_days"] = crossing(AT_RISK_MIN_HEALTH)
+
+    return result
\ No newline at end of file
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import func, case
 from sqlalchemy.orm import Session
 from skillrot_app.db.database import get_db
-from skillrot_app.services.reminder_service import check_and_create_reminders
+from skillrot_app.core.etag import make_etag, etag_matches, not_modified, set_etag
+from skillrot_app.services.reminder_service import (
+    check_and_create_reminders,
+    check_and_create_reminders_bulk
+)
+from skillrot_app.services.email_dispatch_service import dispatch_outbox
 from skillrot_app.models.reminder import Reminder
 
 router = APIRouter(prefix="/reminders", tags=["Reminders"])
@@ -11,24 +17,60 @@ router = APIRouter(prefix="/reminders", tags=["Reminders"])
 # 🔹 1️⃣ Manual Reminder Trigger (Admin / Testing)
 # =====================================================
 @router.post("/run")
-def run_reminder_check(db: Session = Depends(get_db)):
+def run_reminder_check(bulk: bool = True, db: Session = Depends(get_db)):
     """
     Manually trigger reminder scan.
     Useful for testing before scheduler is added.
+    Pass bulk=false to use the per-skill path.
     """
-    check_and_create_reminders(db)
+    if bulk:
+        check_and_create_reminders_bulk(db)
+    else:
+        check_and_create_reminders(db)
     return {"message": "Reminder check executed"}
 
 
+@router.post("/dispatch")
+def run_email_dispatch(db: Session = Depends(get_db)):
+    """
+    Deliver queued reminder emails now instead of waiting for the
+    scheduler's dispatcher.
+    """
+    return {"message": "Email dispatch executed", "result": dispatch_outbox(db)}
+
+
 # =====================================================
 # 🔹 2️⃣ Get User In-App Reminders
 # =====================================================
 @router.get("/user/{user_id}")
-def get_user_reminders(user_id: int, db: Session = Depends(get_db)):
+def get_user_reminders(
+    user_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """
     Fetch all reminders for a user.
     Frontend will call this after login.
+    Honors If-None-Match (304 when nothing changed).
     """
+    # email_id is set (digests) and email_sent flips after creation,
+    # so count linked and sent reminders too
+    version = (
+        db.query(
+            func.max(Reminder.created_at),
+            func.count(Reminder.id),
+            func.count(Reminder.email_id),
+            func.sum(case((Reminder.email_sent == True, 1), else_=0))
+        )
+        .filter(Reminder.user_id == user_id)
+        .one()
+    )
+
+    etag = make_etag("reminders", user_id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     reminders = (
         db.query(Reminder)
         .filter(Reminder.user_id == user_id)
@@ -36,4 +78,6 @@ def get_user_reminders(user_id: int, db: Session = Depends(get_db)):
         .all()
     )
 
+    set_etag(response, etag)
+
     return reminders
\ No newline at end of file
@@ -4,6 +4,8 @@ from skillrot_app.db.database import get_db
 from skillrot_app.models.skill import Skill
 from skillrot_app.models.skill_history import SkillHistory
 from skillrot_app.schemas.skill_history import SkillUsageCreate
+from skillrot_app.services.skill_state_service import record_usage
+from skillrot_app.services.user_version_service import bump_user_version
 
 router = APIRouter(prefix="/skills", tags=["Skill History"])
 
@@ -25,6 +27,8 @@ def log_skill_usage(
     )
 
     db.add(history)
+    record_usage(skill_id, history.date, history.usage, db)
+    bump_user_version(db, user_id=skill.user_id)
     db.commit()
 
     return {"message": "Usage logged successfully"}
@@ -5,6 +5,8 @@ from skillrot_app.models.skill import Skill
 from skillrot_app.schemas.skill import SkillCreate, SkillOut
 from skillrot_app.core.security import get_current_user
 from skillrot_app.models.user import User
+from skillrot_app.services.user_version_service import bump_user_version
+from skillrot_app.services.skill_state_service import reset_next_due
 
 router = APIRouter(prefix="/skills", tags=["Skills"])
 
@@ -24,6 +26,7 @@ def create_skill(
     )
 
     db.add(new_skill)
+    bump_user_version(db, user_id=current_user.id)
     db.commit()
     db.refresh(new_skill)
 
@@ -50,10 +53,15 @@ def update_skill(
     if not db_skill:
         raise HTTPException(status_code=404, detail="Skill not found")
 
+    # Level / learned date feed the decay curve → due date moves
+    if db_skill.level != skill.level or db_skill.learned_date != skill.learned_date:
+        reset_next_due(skill_id, db)
+
     db_skill.name = skill.name
     db_skill.level = skill.level
     db_skill.learned_date = skill.learned_date
 
+    bump_user_version(db, user_id=current_user.id)
     db.commit()
     db.refresh(db_skill)
 
@@ -80,6 +88,7 @@ def delete_skill(
         raise HTTPException(status_code=404, detail="Skill not found")
 
     db.delete(skill)
+    bump_user_version(db, user_id=current_user.id)
     db.commit()
 
     return {"message": "Skill deleted successfully"}
@@ -0,0 +1,131 @@
+import time
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe bounded LRU cache whose entries also expire after
+    `ttl` seconds. Expired entries are dropped on access and when
+    they reach the LRU end during eviction.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+
+            if entry is _MISSING:
+                return default
+
+            value, expires = entry
+
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key: the first caller
+    runs the function, everyone else arriving meanwhile waits and
+    receives the same result (or exception).
+
+    `timeout` bounds a follower's wait (the leader runs `fn` to
+    completion); on expiry the follower gets TimeoutError.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout: float = None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call '{key}'")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+
+        except BaseException as e:
+            call.error = e
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class CachedLoader:
+    """TTLCache + SingleFlight: one computation per key, shared and reused."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize, ttl)
+        self.flight = SingleFlight()
+
+    def get_or_compute(self, key, fn):
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def load():
+            # Re-check: a previous leader may have filled it
+            value = self.cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = fn()
+                self.cache.set(key, value)
+            return value
+
+        return self.flight.do(key, load)
@@ -16,12 +16,30 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str | None = None
     LLM_ENABLED: bool = False
     YOUTUBE_API_KEY: str | None = None
+    # Identical prompts are answered from the resource cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 604800
+    LLM_CACHE_MEMORY_SIZE: int = 1024
 
     # -----------------------------------
     # 🔹 Email
     # -----------------------------------
     EMAIL_ADDRESS: str | None = None
     EMAIL_PASSWORD: str | None = None
+    # sendgrid | smtp | file (file/smtp are local stand-ins for testing)
+    EMAIL_TRANSPORT: str = "sendgrid"
+    EMAIL_FILE_DIR: str = "outbox"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    SMTP_USE_TLS: bool = False
+    EMAIL_HTTP_TIMEOUT_SECONDS: float = 10
+    # Outbox dispatcher
+    EMAIL_BATCH_SIZE: int = 500
+    EMAIL_DISPATCH_CONCURRENCY: int = 4
+    EMAIL_DISPATCH_INTERVAL_SECONDS: int = 30
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_BACKOFF_BASE_SECONDS: int = 30
+    EMAIL_BACKOFF_MAX_SECONDS: int = 3600
 
     # -----------------------------------
     # 🔐 JWT
@@ -31,6 +49,67 @@ class Settings(BaseSettings):
 
     # 🔁 Scheduler / Cron
     CRON_SECRET: str | None = None
+    # Only the elected process runs scheduler jobs (see core/leader.py)
+    SCHEDULER_LEADER_ELECTION: bool = True
+    LEADER_CHECK_SECONDS: int = 15
+    LEADER_LEASE_SECONDS: int = 60
+
+    # -----------------------------------
+    # ⚡ Caching
+    # -----------------------------------
+    DASHBOARD_CACHE_SIZE: int = 1024
+    DASHBOARD_CACHE_TTL_SECONDS: int = 300
+
+    # -----------------------------------
+    # 🎯 Recommendations
+    # -----------------------------------
+    # Overall budget for one recommendation (LLM + resource lookups);
+    # lookups still running at the deadline are dropped
+    RECOMMENDATION_DEADLINE_SECONDS: float = 8
+    # Shared pool for the YouTube / Wikipedia fan-out
+    RECOMMENDATION_FETCH_WORKERS: int = 16
+
+    # -----------------------------------
+    # 🗃 Resource Cache (YouTube / Wikipedia lookups)
+    # -----------------------------------
+    RESOURCE_CACHE_MEMORY_SIZE: int = 2048
+    # In-process tier; the shared table is the source of truth
+    RESOURCE_CACHE_MEMORY_TTL_SECONDS: int = 300
+    RESOURCE_CACHE_TTL_SECONDS: int = 86400
+    # Lookups that found nothing
+    RESOURCE_CACHE_NEGATIVE_TTL_SECONDS: int = 3600
+    # How long past expiry an entry is still served while refreshing
+    RESOURCE_CACHE_STALE_SECONDS: int = 604800
+
+    # -----------------------------------
+    # 🔔 Reminder Sweep
+    # -----------------------------------
+    # One email per user per sweep listing all due skills
+    REMINDER_DIGEST: bool = True
+    # Worker threads per process; several processes may sweep at once
+    REMINDER_SWEEP_WORKERS: int = 4
+    # Skills per claimed chunk
+    REMINDER_SWEEP_CHUNK_SIZE: int = 1000
+    # A running chunk not finished within this is reclaimed
+    REMINDER_SWEEP_LEASE_MINUTES: int = 15
+
+    # -----------------------------------
+    # 🗄 Health History Retention
+    # -----------------------------------
+    # Raw snapshots older than this are compacted into skill_health_daily
+    HEALTH_HISTORY_RETENTION_DAYS: int = 90
+
+    # -----------------------------------
+    # 🔍 Query Debugging (N+1 detector)
+    # -----------------------------------
+    QUERY_DEBUG: bool = False
+    # Raise instead of log when a budget is exceeded (tests / CI)
+    QUERY_BUDGET_STRICT: bool = False
+    QUERY_BUDGET_DEFAULT: int = 50
+    # Per-endpoint overrides, keyed "METHOD /route/{template}" (JSON in env)
+    QUERY_BUDGETS: dict[str, int] = {}
+    # Same statement fingerprint repeated this often → likely N+1
+    N_PLUS_ONE_THRESHOLD: int = 5
 
     # -----------------------------------
     # ⚙ Config
@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 BASE_DECAY_RATE = 0.003
 MAX_DECAY_DAYS = 365
@@ -6,6 +7,19 @@ MAX_HEALTH = 100
 MIN_HEALTH = 0
 RECOVERY_RATE = 0.25  # 25% recovery toward baseline
 
+# Level codes used by the batch API (index into LEVEL_BASELINES)
+LEVEL_CODES = {
+    "beginner": 0,
+    "intermediate": 1,
+    "advanced": 2
+}
+LEVEL_BASELINES = np.array([60.0, 75.0, 90.0])
+DEFAULT_LEVEL_CODE = LEVEL_CODES["intermediate"]
+
+# Subtopics decay linearly from their anchor health
+SUBTOPIC_DAILY_DECAY = 0.02
+SUBTOPIC_MAX_DECAY = 50
+
 
 def compute_decay_score(
     days_since_last_use: int,
@@ -22,56 +36,205 @@ def compute_decay_score(
     - Small consistency bonus
     """
 
-    # --------------------------------
-    # 🎯 Level-Based Baseline
-    # --------------------------------
-    baseline_map = {
-        "beginner": 60,
-        "intermediate": 75,
-        "advanced": 90
-    }
-
-    baseline = baseline_map.get(
+    # 🎯 Level-based baseline
+    level_code = LEVEL_CODES.get(
         skill_level.lower() if skill_level else "intermediate",
-        75
+        DEFAULT_LEVEL_CODE
     )
+    baseline = int(LEVEL_BASELINES[level_code])
 
-    # --------------------------------
-    # 📉 Exponential Forgetting
-    # --------------------------------
-    effective_days = min(days_since_last_use, MAX_DECAY_DAYS)
+    # Single source of truth for the formula (shared with the batch API)
+    final_score = _scalar_score(
+        days_since_last_use,
+        usage_frequency,
+        level_code,
+        previous_health
+    )
+
+    # Debug Logs
+    print("DEBUG → baseline:", baseline)
+    print("DEBUG → previous_health:", previous_health)
+    print("DEBUG → days:", days_since_last_use)
+    print("DEBUG → final_score:", final_score)
 
-    decay_multiplier = math.exp(-BASE_DECAY_RATE * effective_days)
-    decayed_health = baseline * decay_multiplier
+    return final_score
+
+
+def encode_levels(levels) -> np.ndarray:
+    """
+    Map skill level strings to the integer codes used by
+    compute_decay_scores / _scalar_score. Unknown / empty levels
+    fall back to intermediate.
+    """
+    return np.fromiter(
+        (
+            LEVEL_CODES.get(level.lower() if level else "intermediate", DEFAULT_LEVEL_CODE)
+            for level in levels
+        ),
+        dtype=np.int8
+    )
+
+
+def _scalar_score(
+    days_since_last_use: int,
+    usage_frequency: float,
+    level_code: int,
+    previous_health: float = None
+) -> float:
+    """
+    Print-free scalar formula behind compute_decay_score. Also used
+    by the batch API for values sitting on a rounding boundary.
+    """
+    baseline = int(LEVEL_BASELINES[level_code])
 
-    # --------------------------------
-    # 📈 Controlled Recovery
-    # --------------------------------
     if previous_health is not None and days_since_last_use == 0:
-        # Recover only part of the gap toward BASELINE
-        recovered = previous_health + RECOVERY_RATE * (baseline - previous_health)
-        health = recovered
+        health = previous_health + RECOVERY_RATE * (baseline - previous_health)
     else:
-        health = decayed_health
+        effective_days = min(days_since_last_use, MAX_DECAY_DAYS)
+        health = baseline * math.exp(-BASE_DECAY_RATE * effective_days)
 
-    # --------------------------------
-    # 📊 Small Usage Bonus
-    # --------------------------------
-    usage_bonus = min(usage_frequency * 3, 5)
-    health += usage_bonus
+    health += min(usage_frequency * 3, 5)
+
+    return round(max(MIN_HEALTH, min(MAX_HEALTH, health)), 2)
+
+
+def compute_decay_scores(
+    days_since_last_use,
+    usage_frequency,
+    level_codes,
+    previous_health=None
+) -> np.ndarray:
+    """
+    Vectorized compute_decay_score for many skills at once.
+
+    - days_since_last_use: int array
+    - usage_frequency: float array
+    - level_codes: int array (see encode_levels)
+    - previous_health: float array, NaN where there is no previous health
+      (or None for "no previous health" everywhere)
+
+    Returns a float array matching compute_decay_score element-wise,
+    clamping and 2-decimal rounding included.
+    """
+
+    days = np.asarray(days_since_last_use, dtype=np.int64)
+    freq = np.asarray(usage_frequency, dtype=np.float64)
+    codes = np.asarray(level_codes, dtype=np.intp)
+
+    if previous_health is None:
+        previous = np.full(days.shape, np.nan)
+    else:
+        previous = np.asarray(previous_health, dtype=np.float64)
+
+    baseline = LEVEL_BASELINES[codes]
+
+    # 📉 Exponential forgetting
+    effective_days = np.minimum(days, MAX_DECAY_DAYS)
+    health = baseline * np.exp(-BASE_DECAY_RATE * effective_days)
+
+    # 📈 Controlled recovery (practiced today with known previous health)
+    recovering = (days == 0) & ~np.isnan(previous)
+    health = np.where(
+        recovering,
+        previous + RECOVERY_RATE * (baseline - previous),
+        health
+    )
+
+    # 📊 Usage bonus + clamp
+    health = health + np.minimum(freq * 3, 5)
+    health = np.clip(health, MIN_HEALTH, MAX_HEALTH)
+
+    scores = np.round(health, 2)
 
     # --------------------------------
-    # 🔒 Clamp Final Value
+    # 🎯 Exactness Fix-up
     # --------------------------------
-    final_score = round(
-        max(MIN_HEALTH, min(MAX_HEALTH, health)),
-        2
+    # np.round and np.exp can disagree with Python's round / math.exp
+    # by one ulp. That only matters when the value sits on a .xx5
+    # rounding boundary, so recompute those few with the scalar path.
+    scaled = health * 100
+    ambiguous = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+
+    for i in np.flatnonzero(ambiguous):
+        prev = previous.flat[i]
+        scores.flat[i] = _scalar_score(
+            int(days.flat[i]),
+            float(freq.flat[i]),
+            int(codes.flat[i]),
+            None if np.isnan(prev) else float(prev)
+        )
+
+    return scores
+
+
+def compute_subtopic_scores(anchor_health, elapsed_days) -> np.ndarray:
+    """
+    Vectorized subtopic health: anchor health minus linear decay
+    for the days elapsed since the anchor date, capped at
+    SUBTOPIC_MAX_DECAY, floored at 0 and rounded to 2 decimals.
+
+    Pure function of (anchor, elapsed) → the same inputs always
+    give the same result, however often it is read.
+    """
+
+    anchor = np.asarray(anchor_health, dtype=np.float64)
+    days = np.maximum(np.asarray(elapsed_days, dtype=np.int64), 0)
+
+    decay = np.minimum(days * SUBTOPIC_DAILY_DECAY, SUBTOPIC_MAX_DECAY)
+
+    return np.round(np.maximum(anchor - decay, 0), 2)
+
+
+def days_until_below(
+    threshold: float,
+    skill_level: str,
+    usage_frequency: float = 0.0
+):
+    """
+    Closed-form first day (counted from last use) on which the
+    rounded decay score drops strictly below `threshold`, assuming
+    no further practice.
+
+    Solves baseline * exp(-r * d) + bonus < threshold for d.
+    Returns 0 if already below at day 0 and None if the score never
+    gets there (threshold under the MAX_DECAY_DAYS plateau).
+    """
+
+    code = LEVEL_CODES.get(
+        skill_level.lower() if skill_level else "intermediate",
+        DEFAULT_LEVEL_CODE
     )
+    baseline = LEVEL_BASELINES[code]
+    bonus = min(usage_frequency * 3, 5)
 
-    # Debug Logs
-    print("DEBUG → baseline:", baseline)
-    print("DEBUG → previous_health:", previous_health)
-    print("DEBUG → days:", days_since_last_use)
-    print("DEBUG → final_score:", final_score)
+    # round(x, 2) < threshold  ⇔  x < threshold - 0.005
+    target = threshold - 0.005 - bonus
+
+    if target <= 0:
+        return None
+
+    if baseline <= target:
+        day = 0
+    else:
+        day = math.floor(math.log(baseline / target) / BASE_DECAY_RATE) + 1
+
+    if day > MAX_DECAY_DAYS:
+        return None
+
+    # Guard against float error at the boundary: settle on the
+    # first day whose exact score is below threshold.
+    probe = np.array([max(day - 1, 0), day])
+    scores = compute_decay_scores(
+        probe,
+        np.full(2, usage_frequency),
+        np.full(2, code)
+    )
+
+    if day > 0 and scores[0] < threshold:
+        day -= 1
+    elif scores[1] >= threshold:
+        day += 1
+        if day > MAX_DECAY_DAYS:
+            return None
 
-    return final_score
\ No newline at end of file
+    return day
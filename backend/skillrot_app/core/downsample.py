@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most `threshold` points of the series
+    (x ascending) that best preserve its visual shape. First and last
+    points are always kept.
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    count = len(x)
+
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+
+    previous = 0
+
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Triangle areas (×2) against the previously selected point
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
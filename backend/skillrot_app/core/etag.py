@@ -0,0 +1,39 @@
+import hashlib
+from datetime import date
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag over a resource's version parts (ids, max timestamps,
+    counts, data_version …). Today's date is always mixed in so tags
+    roll over when decay advances.
+    """
+
+    raw = "|".join(str(p) for p in (*parts, date.today()))
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    candidates = (tag.strip() for tag in header.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def set_etag(response: Response, etag: str):
+    # no-cache: clients may store the body but must revalidate first
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
@@ -0,0 +1,192 @@
+import zlib
+import socket
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import text, update, or_
+from sqlalchemy.orm import Session
+
+from skillrot_app.models.scheduler_lease import SchedulerLease
+from skillrot_app.db.upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElector:
+    """
+    Elects one process (across all workers / hosts sharing the DB) to
+    run the scheduler.
+
+    - PostgreSQL: session-level pg_try_advisory_lock on a dedicated
+      connection. The lock dies with the connection, so a crashed
+      leader is replaced on the next retry.
+    - Anything else (SQLite): a lease row renewed every `interval`
+      seconds and taken over once it has been stale for `lease` seconds.
+
+    `on_elected` / `on_demoted` run on the elector's thread.
+    """
+
+    def __init__(self, engine, name: str, on_elected, on_demoted,
+                 interval: float = 15, lease: float = 60):
+        self.engine = engine
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.interval = interval
+        self.lease = lease
+
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+
+        self._key = zlib.crc32(name.encode())
+        self._conn = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"leader-{self.name}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+        self._release()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                leader = self._try_acquire()
+            except Exception:
+                logger.exception("Leader election check failed")
+                self._drop_connection()
+                leader = False
+
+            if leader and not self.is_leader:
+                logger.info(f"{self.identity} elected leader for '{self.name}'")
+                self.is_leader = True
+                self.on_elected()
+
+            elif not leader and self.is_leader:
+                logger.warning(f"{self.identity} lost leadership for '{self.name}'")
+                self.is_leader = False
+                self.on_demoted()
+
+            self._stop.wait(self.interval)
+
+    # -----------------------------------------------------
+    # Acquire / renew
+    # -----------------------------------------------------
+    def _try_acquire(self) -> bool:
+        if self.engine.dialect.name == "postgresql":
+            return self._try_advisory_lock()
+        return self._try_lease()
+
+    def _try_advisory_lock(self) -> bool:
+
+        # Already holding it: just make sure the connection is alive
+        if self.is_leader and self._conn is not None:
+            self._conn.execute(text("SELECT 1"))
+            # Don't sit "idle in transaction" while leading
+            self._conn.commit()
+            return True
+
+        if self._conn is None:
+            self._conn = self.engine.connect()
+
+        acquired = self._conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"),
+            {"key": self._key}
+        ).scalar()
+
+        # Don't hold an idle transaction open between checks
+        self._conn.commit()
+
+        return bool(acquired)
+
+    def _try_lease(self) -> bool:
+
+        now = datetime.utcnow()
+
+        with Session(self.engine) as db:
+
+            # Seeded already expired so the first check can take it
+            upsert(
+                db,
+                SchedulerLease,
+                [{"name": self.name, "holder": None, "expires_at": now - timedelta(seconds=1)}],
+                index_elements=["name"]
+            )
+
+            # Renew our own lease or take over an expired one
+            result = db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(
+                        SchedulerLease.holder == self.identity,
+                        SchedulerLease.expires_at < now
+                    )
+                )
+                .values(
+                    holder=self.identity,
+                    expires_at=now + timedelta(seconds=self.lease)
+                )
+            )
+            db.commit()
+
+            return result.rowcount == 1
+
+    # -----------------------------------------------------
+    # Release
+    # -----------------------------------------------------
+    def _release(self):
+        if not self.is_leader:
+            self._drop_connection()
+            return
+
+        self.is_leader = False
+
+        try:
+            if self.engine.dialect.name == "postgresql":
+                if self._conn is not None:
+                    self._conn.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": self._key}
+                    )
+                    self._conn.commit()
+            else:
+                with Session(self.engine) as db:
+                    db.execute(
+                        update(SchedulerLease)
+                        .where(
+                            SchedulerLease.name == self.name,
+                            SchedulerLease.holder == self.identity
+                        )
+                        .values(holder=None, expires_at=datetime.utcnow())
+                    )
+                    db.commit()
+        except Exception:
+            logger.exception("Failed to release leadership")
+        finally:
+            self._drop_connection()
+
+    def _drop_connection(self):
+        # Invalidate rather than return it to the pool: a pooled
+        # connection would keep a session-level advisory lock alive
+        if self._conn is not None:
+            try:
+                self._conn.invalidate()
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
@@ -0,0 +1,235 @@
+import os
+import re
+import time
+import contextvars
+import collections
+from functools import wraps
+
+from fastapi import Request
+from prometheus_client import (
+    Counter,
+    Histogram,
+    CollectorRegistry,
+    REGISTRY,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+
+# =========================================================
+# 🔹 METRIC DEFINITIONS
+# =========================================================
+
+REQUEST_LATENCY = Histogram(
+    "skillrot_http_request_duration_seconds",
+    "HTTP request latency per router",
+    ["router", "method", "status"]
+)
+
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "skillrot_db_statements_per_request",
+    "SQL statements executed while serving one request",
+    ["router"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+)
+
+DB_TIME_PER_REQUEST = Histogram(
+    "skillrot_db_time_per_request_seconds",
+    "Time spent executing SQL while serving one request",
+    ["router"]
+)
+
+DB_STATEMENTS_TOTAL = Counter(
+    "skillrot_db_statements_total",
+    "SQL statements executed, by router ('background' outside requests)",
+    ["router"]
+)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "skillrot_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled DB connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+SCHEDULER_JOB_DURATION = Histogram(
+    "skillrot_scheduler_job_duration_seconds",
+    "Scheduler job run time",
+    ["job"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+)
+
+
+# =========================================================
+# 🔹 PER-REQUEST QUERY STATS
+# =========================================================
+
+class QueryStats:
+    """
+    SQL statement count / time for the current request.
+    `fingerprints` is only collected when something asks for it
+    (see core/query_inspector.py).
+    """
+
+    def __init__(self, collect_fingerprints: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = collections.Counter() if collect_fingerprints else None
+
+
+# Set by the middleware; shared with the threadpool running sync endpoints
+current_query_stats = contextvars.ContextVar("current_query_stats", default=None)
+
+
+def instrument_engine(engine):
+    """Attach statement counting / timing listeners to an Engine."""
+
+    # The start time lives on the statement's execution context, not a
+    # per-connection stack: a failed statement (no after_cursor_execute)
+    # then can't skew the timing of later statements on the connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        elapsed = time.perf_counter() - start if start is not None else 0.0
+
+        stats = current_query_stats.get()
+
+        if stats is None:
+            DB_STATEMENTS_TOTAL.labels(router="background").inc()
+            return
+
+        stats.count += 1
+        stats.duration += elapsed
+
+        if stats.fingerprints is not None:
+            stats.fingerprints[fingerprint(statement)] += 1
+
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_PARAM = re.compile(r"%\(\w+\)s|\?|:\w+|\$\d+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a SQL statement so repeats of the same query with
+    different parameters / IN-list sizes compare equal.
+    """
+
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _IN_LIST.sub("IN (...)", text)
+    text = _PARAM.sub("?", text)
+    return _LITERAL.sub("?", text)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+# =========================================================
+# 🔹 MIDDLEWARE
+# =========================================================
+
+API_MODULE_PREFIX = "skillrot_app.api."
+
+
+def router_label(request: Request) -> str:
+    """
+    Router module of the matched route, e.g. api/skill_history.py →
+    skill_history. Path prefixes are shared (/skills is used by three
+    routers), modules are not. Routes defined outside api/ (/, /docs,
+    /openapi.json) → "app".
+    """
+
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+
+    module = getattr(getattr(route, "endpoint", None), "__module__", "") or ""
+
+    if not module.startswith(API_MODULE_PREFIX):
+        return "app"
+
+    return module[len(API_MODULE_PREFIX):]
+
+
+async def metrics_middleware(request: Request, call_next):
+
+    # Reuse stats set by an outer middleware (query inspector)
+    stats = current_query_stats.get() or QueryStats()
+    token = current_query_stats.set(stats)
+    start = time.perf_counter()
+    status = 500
+
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+
+    finally:
+        current_query_stats.reset(token)
+
+        router = router_label(request)
+
+        REQUEST_LATENCY.labels(
+            router=router,
+            method=request.method,
+            status=str(status)
+        ).observe(time.perf_counter() - start)
+
+        DB_STATEMENTS_PER_REQUEST.labels(router=router).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(router=router).observe(stats.duration)
+        DB_STATEMENTS_TOTAL.labels(router=router).inc(stats.count)
+
+
+# =========================================================
+# 🔹 SCHEDULER JOBS
+# =========================================================
+
+def timed_job(name: str):
+    """Decorator recording a scheduler job's duration."""
+
+    def decorator(func):
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with SCHEDULER_JOB_DURATION.labels(job=name).time():
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# =========================================================
+# 🔹 EXPOSITION
+# =========================================================
+
+def render_metrics():
+    """
+    Prometheus text format. Under gunicorn with several workers set
+    PROMETHEUS_MULTIPROC_DIR so every worker's samples are merged.
+    """
+
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
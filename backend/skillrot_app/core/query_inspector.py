@@ -0,0 +1,108 @@
+import logging
+from contextlib import contextmanager
+
+from fastapi import Request
+
+from skillrot_app.core.config import settings
+from skillrot_app.core.metrics import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a request runs more SQL than allowed."""
+
+
+def endpoint_key(request: Request) -> str | None:
+    """'GET /dashboard/user/{user_id}' for the matched route."""
+
+    route = request.scope.get("route")
+    if route is None:
+        return None
+
+    return f"{request.method} {route.path}"
+
+
+def budget_for(endpoint: str) -> int:
+    return settings.QUERY_BUDGETS.get(endpoint, settings.QUERY_BUDGET_DEFAULT)
+
+
+def repeated_statements(stats: QueryStats, threshold: int = None) -> list:
+    """[(count, fingerprint)] for statements repeated at least `threshold` times."""
+
+    threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+
+    return [
+        (count, statement)
+        for statement, count in stats.fingerprints.most_common()
+        if count >= threshold
+    ]
+
+
+def check_budget(endpoint: str, stats: QueryStats, budget: int, strict: bool):
+    """Log repeated fingerprints and enforce the statement budget."""
+
+    for count, statement in repeated_statements(stats):
+        logger.warning(f"Possible N+1 on {endpoint}: {count}x {statement[:200]}")
+
+    if stats.count <= budget:
+        return
+
+    message = (
+        f"Query budget exceeded on {endpoint}: "
+        f"{stats.count} statements (budget {budget})"
+    )
+
+    if strict:
+        raise QueryBudgetExceeded(message)
+
+    logger.error(message)
+
+
+async def query_inspector_middleware(request: Request, call_next):
+    """
+    Opt-in (QUERY_DEBUG) middleware: counts statements per request,
+    logs repeated statement fingerprints and enforces per-endpoint
+    budgets. Register outside metrics_middleware so both share stats.
+    """
+
+    stats = QueryStats(collect_fingerprints=True)
+    token = current_query_stats.set(stats)
+
+    try:
+        response = await call_next(request)
+    finally:
+        current_query_stats.reset(token)
+
+    endpoint = endpoint_key(request)
+
+    if endpoint is not None:
+        check_budget(
+            endpoint,
+            stats,
+            budget_for(endpoint),
+            strict=settings.QUERY_BUDGET_STRICT
+        )
+
+    return response
+
+
+@contextmanager
+def query_budget(max_statements: int, label: str = "block"):
+    """
+    Test helper: fail if the wrapped code runs more than
+    `max_statements` SQL statements.
+
+        with query_budget(3):
+            get_user_dashboard(user_id, db)
+    """
+
+    stats = QueryStats(collect_fingerprints=True)
+    token = current_query_stats.set(stats)
+
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+    check_budget(label, stats, max_statements, strict=True)
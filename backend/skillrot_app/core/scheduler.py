@@ -1,19 +1,93 @@
+import logging
 from apscheduler.schedulers.background import BackgroundScheduler
-from skillrot_app.db.database import SessionLocal
-from skillrot_app.services.reminder_service import check_and_create_reminders
+from skillrot_app.db.database import SessionLocal, engine
+from skillrot_app.core.config import settings
+from skillrot_app.core.leader import LeaderElector
+from skillrot_app.core.metrics import timed_job
+from skillrot_app.services.reminder_service import run_reminder_sweep
+from skillrot_app.services.health_rollup_service import run_health_rollup
+from skillrot_app.services.email_dispatch_service import dispatch_outbox
+from skillrot_app.services.resource_cache_service import purge_resource_cache
+
+logger = logging.getLogger(__name__)
 
 scheduler = BackgroundScheduler()
+elector = None
 
 
 def start_scheduler():
+    global elector
 
+    @timed_job("reminder_sweep")
     def job():
+        # Workers open their own sessions; only skills that are due
+        run_reminder_sweep(SessionLocal)
+
+    @timed_job("reminder_full_sweep")
+    def full_job():
+        # Every skill once a day: daily snapshots + fresh due dates
+        run_reminder_sweep(SessionLocal, due_only=False)
+
+    @timed_job("email_dispatch")
+    def email_job():
+        db = SessionLocal()
+        try:
+            dispatch_outbox(db)
+        finally:
+            db.close()
+
+    @timed_job("health_rollup")
+    def rollup_job():
+        db = SessionLocal()
+        try:
+            run_health_rollup(db)
+        finally:
+            db.close()
+
+    @timed_job("resource_cache_purge")
+    def cache_purge_job():
         db = SessionLocal()
         try:
-            check_and_create_reminders(db)
+            purge_resource_cache(db)
         finally:
             db.close()
 
     # Run every 1 hour
     scheduler.add_job(job, "interval", hours=1)
-    scheduler.start()
\ No newline at end of file
+
+    scheduler.add_job(full_job, "cron", hour=0, minute=5)
+
+    # Drain the email outbox (reminders are only queued by the sweeps)
+    scheduler.add_job(email_job, "interval", seconds=settings.EMAIL_DISPATCH_INTERVAL_SECONDS)
+
+    # Roll up yesterday's snapshots shortly after midnight
+    scheduler.add_job(rollup_job, "cron", hour=0, minute=30)
+
+    # Drop cached lookups too old to be served even stale
+    scheduler.add_job(cache_purge_job, "cron", hour=0, minute=45)
+
+    if not settings.SCHEDULER_LEADER_ELECTION:
+        scheduler.start()
+        return
+
+    # Every worker starts paused; only the elected leader resumes
+    scheduler.start(paused=True)
+
+    elector = LeaderElector(
+        engine,
+        "scheduler",
+        on_elected=scheduler.resume,
+        on_demoted=scheduler.pause,
+        interval=settings.LEADER_CHECK_SECONDS,
+        lease=settings.LEADER_LEASE_SECONDS
+    )
+    elector.start()
+
+
+def stop_scheduler():
+
+    if elector is not None:
+        elector.stop()
+
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
@@ -1,7 +1,16 @@
+# Minimum health for each status (see classify_skill)
+STABLE_MIN_HEALTH = 80
+AT_RISK_MIN_HEALTH = 60
+
+# Reminder triggers: health below this, or no activity for longer than this
+REMINDER_HEALTH_THRESHOLD = 50
+REMINDER_INACTIVITY_DAYS = 14
+
+
 def classify_skill(score: float) -> str:
-    if score >= 80:
+    if score >= STABLE_MIN_HEALTH:
         return "Stable"
-    elif score >= 60:
+    elif score >= AT_RISK_MIN_HEALTH:
         return "At-Risk"
     else:
         return "Critical"
@@ -4,6 +4,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from skillrot_app.models.base import Base
+from skillrot_app.core.metrics import instrument_engine, TimedQueuePool
 
 # Load .env
 load_dotenv()
@@ -17,9 +18,13 @@ logger = logging.getLogger(__name__)
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    poolclass=TimedQueuePool,
     connect_args={"sslmode": "require"}
 )
 
+# 📈 Per-request SQL counts / timings for /metrics
+instrument_engine(engine)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -0,0 +1,38 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, model, rows: list, index_elements: list, update_columns: dict = None):
+    """
+    INSERT ... ON CONFLICT (index_elements) DO UPDATE for a list of rows.
+
+    update_columns maps column name → value to set on conflict.
+    Use None as the value to take the incoming (EXCLUDED) value.
+    Without update_columns conflicting rows are left alone (DO NOTHING).
+    """
+
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model)
+    else:
+        raise NotImplementedError(f"upsert not supported for dialect '{dialect}'")
+
+    if update_columns is None:
+        db.execute(stmt.on_conflict_do_nothing(index_elements=index_elements), rows)
+        return
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={
+            column: stmt.excluded[column] if value is None else value
+            for column, value in update_columns.items()
+        }
+    )
+
+    db.execute(stmt, rows)
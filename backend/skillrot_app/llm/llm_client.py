@@ -1,39 +1,88 @@
 import os
+import json
+import hashlib
 from groq import Groq
+from skillrot_app.core.config import settings
+from skillrot_app.services.resource_cache_service import ResourceCache
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 LLM_ENABLED = os.getenv("LLM_ENABLED", "false").lower() == "true"
 
+LLM_MODEL = "llama-3.1-8b-instant"
+SYSTEM_PROMPT = "You are an educational assistant. Return only clean JSON when asked."
+TEMPERATURE = 0.2
+
 client = Groq(api_key=GROQ_API_KEY)
 
-def call_llm(prompt: str):
+# 🔹 Responses by prompt hash (memory + shared table). Not served
+# stale: an expired answer is simply asked for again.
+llm_cache = ResourceCache(
+    "llm",
+    memory_size=settings.LLM_CACHE_MEMORY_SIZE,
+    ttl=settings.LLM_CACHE_TTL_SECONDS,
+    stale=0
+)
+
+
+def llm_cache_key(model: str, system: str, user: str, temperature: float) -> str:
+    payload = json.dumps([model, system, user, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _complete(prompt: str, timeout: float = None) -> str:
+    """One uncached completion. Raises on API errors."""
+
+    completion = client.chat.completions.create(
+        model=LLM_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=TEMPERATURE,
+        max_tokens=400,
+        **({"timeout": timeout} if timeout is not None else {})
+    )
+
+    content = completion.choices[0].message.content.strip()
+
+    # Remove accidental markdown formatting
+    if content.startswith("```"):
+        content = content.replace("```json", "").replace("```", "").strip()
+
+    return content
+
+
+def call_llm(prompt: str, timeout: float = None):
     """
     Calls Groq LLM (LLaMA/Mixtral).
     Returns plain text response or None.
+    `timeout` (seconds) bounds the request; None → client default.
+
+    Identical requests (model, prompts, temperature) are answered
+    from the cache; concurrent identical ones share one call.
     """
 
     if not LLM_ENABLED or not GROQ_API_KEY:
         return None
 
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": "You are an educational assistant. Return only clean JSON when asked."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2,
-            max_tokens=400
-        )
+        if not settings.LLM_CACHE_ENABLED:
+            return _complete(prompt, timeout) or None
 
-        content = completion.choices[0].message.content.strip()
+        key = llm_cache_key(LLM_MODEL, SYSTEM_PROMPT, prompt, TEMPERATURE)
 
-        # Remove accidental markdown formatting
-        if content.startswith("```"):
-            content = content.replace("```json", "").replace("```", "").strip()
+        # Joining an identical in-flight call waits no longer than
+        # our own budget, not the leader's
+        return llm_cache.get_or_fetch(
+            key,
+            lambda: _complete(prompt, timeout),
+            timeout=timeout
+        ) or None
 
-        return content
+    except TimeoutError:
+        print("Groq LLM: timed out waiting for identical in-flight request")
+        return None
 
     except Exception as e:
         print("Groq LLM error:", e)
-        return None
\ No newline at end of file
+        return None
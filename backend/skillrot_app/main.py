@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from skillrot_app.core.config import settings
 from skillrot_app.core.logging import setup_logging
 from skillrot_app.core.exceptions import global_exception_handler
-from skillrot_app.core.scheduler import start_scheduler
+from skillrot_app.core.scheduler import start_scheduler, stop_scheduler
+from skillrot_app.core.metrics import metrics_middleware
+from skillrot_app.core.query_inspector import query_inspector_middleware
 
 import logging
 
@@ -22,6 +24,7 @@ from skillrot_app.api.skill_history import router as skill_history_router
 from skillrot_app.api.users import router as users_router
 from skillrot_app.api.health import router as health_router
 from skillrot_app.api.role_filter import router as role_filter_router
+from skillrot_app.api.metrics import router as metrics_router
 
 # 🔹 DB imports
 from skillrot_app.db.database import check_db_connection, engine
@@ -34,6 +37,12 @@ import skillrot_app.models.skill_history
 import skillrot_app.models.subtopic
 import skillrot_app.models.skill_health_history
 import skillrot_app.models.reminder
+import skillrot_app.models.skill_state
+import skillrot_app.models.skill_health_daily
+import skillrot_app.models.sweep_chunk
+import skillrot_app.models.scheduler_lease
+import skillrot_app.models.email_outbox
+import skillrot_app.models.resource_cache
 
 import os
 from dotenv import load_dotenv
@@ -54,6 +63,13 @@ app = FastAPI(
 
 app.add_exception_handler(Exception, global_exception_handler)
 
+# 📈 Request latency + per-request DB stats (see /metrics)
+app.middleware("http")(metrics_middleware)
+
+# 🔍 N+1 detector / per-endpoint query budget (debug only, outermost)
+if settings.QUERY_DEBUG:
+    app.middleware("http")(query_inspector_middleware)
+
 # =========================================================
 # 🔥 ROUTER ORDER (STRICTLY AS REQUESTED)
 # =========================================================
@@ -72,6 +88,7 @@ app.include_router(skill_history_router)   # 11️⃣ Skill History
 app.include_router(users_router)           # 12️⃣ User
 app.include_router(health_router)          # 13️⃣ Health
 app.include_router(role_filter_router)
+app.include_router(metrics_router)         # 📈 Metrics
 
 # =========================================================
 # 🔹 STARTUP / SHUTDOWN
@@ -89,6 +106,7 @@ def startup_event():
 @app.on_event("shutdown")
 def shutdown_event():
     logger.info("SkillRot backend shutting down...")
+    stop_scheduler()
 
 
 # =========================================================
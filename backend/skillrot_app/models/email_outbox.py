@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from skillrot_app.models.base import Base
+
+
+class EmailOutbox(Base):
+    """
+    Queued outbound email. Written in the same transaction as the
+    Reminder(s) pointing at it (Reminder.email_id); delivered later by
+    the dispatcher (services/email_dispatch_service.py).
+    """
+    __tablename__ = "email_outbox"
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+
+    # Key into services/email_templates.TEMPLATES + its substitution values
+    template = Column(String, nullable=False)
+    context = Column(JSON, nullable=False)
+
+    # pending → sending → sent | failed (retries go back to pending)
+    status = Column(String, nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    claimed_by = Column(String, nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -13,4 +13,14 @@ class Reminder(Base):
     message = Column(String, nullable=False)
 
     email_sent = Column(Boolean, default=False)
+
+    # Outbox email carrying this reminder (one per reminder, or one
+    # per user digest). None → not queued yet.
+    email_id = Column(
+        Integer,
+        ForeignKey("email_outbox.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from skillrot_app.models.base import Base
+
+
+class ResourceCacheEntry(Base):
+    """
+    Persistent tier of the resource cache
+    (services/resource_cache_service.py), shared by all workers and
+    kept across restarts. Times are naive UTC.
+    """
+    __tablename__ = "resource_cache"
+
+    # One per ResourceCache: "youtube" / "wikipedia" / "llm"
+    namespace = Column(String, primary_key=True)
+    # Normalized topic (prompt hash for "llm")
+    key = Column(String, primary_key=True)
+
+    # Cached result; empty / null → negative entry
+    value = Column(JSON, nullable=True)
+
+    # Served as-is until fresh_until, then served while refreshing
+    # until stale_until, after which it is a miss
+    fresh_until = Column(DateTime, nullable=False)
+    stale_until = Column(DateTime, nullable=False, index=True)
+
+    updated_at = Column(DateTime, nullable=False)
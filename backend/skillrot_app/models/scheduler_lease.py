@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from skillrot_app.models.base import Base
+
+
+class SchedulerLease(Base):
+    """
+    Leader lease for databases without advisory locks
+    (see core/leader.py). One row per elected role.
+    """
+    __tablename__ = "scheduler_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey
+from skillrot_app.models.base import Base
+
+
+class SkillHealthDaily(Base):
+    """
+    Per-skill, per-day rollup of SkillHealthHistory.
+    Filled for closed days by the rollup job (services/health_rollup_service.py);
+    raw rows past the retention window only survive here.
+    """
+    __tablename__ = "skill_health_daily"
+
+    skill_id = Column(
+        Integer,
+        ForeignKey("skills.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+
+    min_health = Column(Float, nullable=False)
+    max_health = Column(Float, nullable=False)
+    avg_health = Column(Float, nullable=False)
+
+    # Health of the day's latest snapshot
+    last_health = Column(Float, nullable=False)
+
+    samples = Column(Integer, nullable=False)
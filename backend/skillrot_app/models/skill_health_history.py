@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from datetime import date
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from skillrot_app.models.base import Base
 
 class SkillHealthHistory(Base):
     __tablename__ = "skill_health_history"
 
+    # One snapshot per skill per day (upserted, see db/upsert.py)
+    __table_args__ = (
+        UniqueConstraint("skill_id", "recorded_on", name="uq_skill_health_history_skill_day"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     skill_id = Column(Integer, ForeignKey("skills.id"))
     health = Column(Float)
-    recorded_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    recorded_on = Column(Date, nullable=False, default=date.today)
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now())
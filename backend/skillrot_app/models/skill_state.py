@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from skillrot_app.models.base import Base
+
+
+class SkillState(Base):
+    """
+    Compact per-skill summary of SkillHistory / SkillHealthHistory.
+    Kept current by the usage write paths so decay recalculation
+    never has to scan the full history.
+    """
+    __tablename__ = "skill_state"
+
+    skill_id = Column(
+        Integer,
+        ForeignKey("skills.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Latest date with usage == 1 (None → fall back to learned_date)
+    last_used = Column(Date, nullable=True)
+
+    # Latest date of any history entry (used or not)
+    last_activity = Column(Date, nullable=True)
+
+    usage_count = Column(Integer, nullable=False, default=0)
+    total_sessions = Column(Integer, nullable=False, default=0)
+
+    # Health of the most recent SkillHealthHistory snapshot
+    latest_health = Column(Float, nullable=True)
+
+    # First day the reminder sweep needs to look at this skill again
+    # (None → unknown, always swept). See decay_service.next_due_date.
+    next_due_on = Column(Date, nullable=True, index=True)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
@@ -16,8 +16,17 @@ class Subtopic(Base):
     name = Column(String, nullable=False)
 
     # 🔥 Keep consistent scale with main health (0–100)
+    # Anchor value: health as of anchored_on. Current health is
+    # derived on read (see decay_engine.compute_subtopic_scores).
     health_score = Column(Float, default=100.0)
 
     last_practiced = Column(Date, nullable=True)
 
+    # Date health_score was last set (practice / assessment).
+    # None → last_practiced, then the skill's learned_date.
+    # Added after the table shipped; create_all won't add it, so
+    # existing databases need (no backfill required):
+    #   ALTER TABLE subtopics ADD COLUMN anchored_on DATE;
+    anchored_on = Column(Date, nullable=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
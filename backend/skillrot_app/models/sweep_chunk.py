@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from skillrot_app.models.base import Base
+
+
+class SweepChunk(Base):
+    """
+    One skill-id range of a background sweep run.
+    Workers claim pending chunks with SELECT … FOR UPDATE SKIP LOCKED
+    (see services/sweep_service.py).
+    """
+    __tablename__ = "sweep_chunks"
+
+    __table_args__ = (
+        UniqueConstraint("sweep_id", "start_id", name="uq_sweep_chunks_sweep_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # e.g. "reminders:due:2026-01-31T14" → one run of the hourly sweep
+    sweep_id = Column(String, nullable=False, index=True)
+
+    # Inclusive skill id range
+    start_id = Column(Integer, nullable=False)
+    end_id = Column(Integer, nullable=False)
+
+    # pending → running → done
+    status = Column(String, nullable=False, default="pending")
+    claimed_by = Column(String, nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from skillrot_app.models.base import Base
@@ -18,6 +18,10 @@ class User(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Bumped on every write affecting the user's dashboard
+    # (see services/user_version_service.py)
+    data_version = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
     # Relationship to Skill model
     skills = relationship(
         "Skill",
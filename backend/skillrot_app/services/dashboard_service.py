@@ -0,0 +1,279 @@
+import json
+import base64
+import bisect
+from itertools import islice
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from skillrot_app.models.skill import Skill
+from skillrot_app.models.skill_state import SkillState
+from skillrot_app.models.skill_health_history import SkillHealthHistory
+from skillrot_app.models.reminder import Reminder
+from skillrot_app.services.decay_service import score_skills
+from skillrot_app.services.skill_state_service import get_skill_states
+from skillrot_app.core.skill_analyzer import classify_skill
+
+# Sorts available for paginated dashboards
+DASHBOARD_SORTS = ("id", "name", "health", "status")
+
+# Only SQL-orderable sorts can stream without scoring every skill first
+STREAM_SORTS = ("id", "name")
+
+# Worst first when sorting by status
+STATUS_ORDER = {"Critical": 0, "At-Risk": 1, "Stable": 2}
+
+# Rows fetched per server-side cursor round trip when streaming
+STREAM_CHUNK_SIZE = 500
+
+
+def _dashboard_query(user_id: int, db: Session):
+    """
+    One statement for the whole dashboard:
+    skills ⟕ skill_state ⟕ latest two health snapshots (ROW_NUMBER + LAG)
+           ⟕ reminder counts (GROUP BY)
+    """
+
+    user_skill_ids = (
+        db.query(Skill.id)
+        .filter(Skill.user_id == user_id)
+        .subquery()
+    )
+
+    ranked_health = (
+        db.query(
+            SkillHealthHistory.skill_id.label("skill_id"),
+            SkillHealthHistory.health.label("health"),
+            func.lag(SkillHealthHistory.health).over(
+                partition_by=SkillHealthHistory.skill_id,
+                order_by=SkillHealthHistory.recorded_at
+            ).label("previous_health"),
+            func.row_number().over(
+                partition_by=SkillHealthHistory.skill_id,
+                order_by=SkillHealthHistory.recorded_at.desc()
+            ).label("rn")
+        )
+        .filter(SkillHealthHistory.skill_id.in_(user_skill_ids.select()))
+        .subquery()
+    )
+
+    latest_health = (
+        db.query(ranked_health)
+        .filter(ranked_health.c.rn == 1)
+        .subquery()
+    )
+
+    reminder_counts = (
+        db.query(
+            Reminder.skill_id.label("skill_id"),
+            func.count(Reminder.id).label("reminders")
+        )
+        .filter(Reminder.skill_id.in_(user_skill_ids.select()))
+        .group_by(Reminder.skill_id)
+        .subquery()
+    )
+
+    return (
+        db.query(
+            Skill.id,
+            Skill.name,
+            Skill.level,
+            Skill.learned_date,
+            SkillState,
+            latest_health.c.health.label("snapshot_health"),
+            latest_health.c.previous_health.label("snapshot_previous_health"),
+            func.coalesce(reminder_counts.c.reminders, 0).label("reminders")
+        )
+        .outerjoin(SkillState, SkillState.skill_id == Skill.id)
+        .outerjoin(latest_health, latest_health.c.skill_id == Skill.id)
+        .outerjoin(reminder_counts, reminder_counts.c.skill_id == Skill.id)
+        .filter(Skill.user_id == user_id)
+    )
+
+
+def _trend(latest, previous) -> str:
+    if latest is None or previous is None:
+        return "stable"
+    if latest > previous:
+        return "up"
+    if latest < previous:
+        return "down"
+    return "stable"
+
+
+def build_dashboard_rows(rows: list, db: Session) -> list:
+    """
+    Turn _dashboard_query rows into dashboard entries, scoring
+    every skill in one vectorized pass.
+    """
+
+    if not rows:
+        return []
+
+    states = {row.id: row.SkillState for row in rows if row.SkillState is not None}
+
+    # Skills never touched since skill_state was introduced
+    missing = [row.id for row in rows if row.SkillState is None]
+    if missing:
+        states.update(get_skill_states(missing, db, backfill=False))
+
+    scores = score_skills(rows, states)
+
+    result = []
+
+    for row, score in zip(rows, scores):
+        health = float(score)
+
+        result.append({
+            "skill_id": row.id,
+            "skill": row.name,
+            "health": health,
+            "status": classify_skill(health),
+            "trend": _trend(row.snapshot_health, row.snapshot_previous_health),
+            "last_practiced": states[row.id].last_activity or row.learned_date,
+            "reminders": row.reminders
+        })
+
+    return result
+
+
+def get_user_dashboard_data(user_id: int, db: Session) -> list:
+    """
+    Read-only dashboard for a user: one query plus in-memory scoring,
+    regardless of how many skills the user has.
+    """
+
+    rows = _dashboard_query(user_id, db).order_by(Skill.id).all()
+
+    return build_dashboard_rows(rows, db)
+
+
+# =========================================================
+# 🔹 CURSOR PAGINATION
+# =========================================================
+
+def _sort_key(sort: str):
+
+    if sort == "health":
+        return lambda e: (e["health"], e["skill_id"])
+
+    if sort == "status":
+        return lambda e: (STATUS_ORDER[e["status"]], e["health"], e["skill_id"])
+
+    if sort == "name":
+        return lambda e: (e["skill"].lower(), e["skill_id"])
+
+    return lambda e: (e["skill_id"],)
+
+
+def encode_cursor(sort: str, key: tuple) -> str:
+    payload = json.dumps({"sort": sort, "key": list(key)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Shape of each sort's key (see _sort_key), checked before comparing
+CURSOR_KEY_TYPES = {
+    "id": (_is_int,),
+    "name": (lambda v: isinstance(v, str), _is_int),
+    "health": (_is_number, _is_int),
+    "status": (_is_int, _is_number, _is_int)
+}
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """
+    Raises ValueError for malformed cursors, a cursor from another
+    sort, or a key whose shape doesn't match the sort (which would
+    otherwise fail comparing against real entries).
+    """
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_sort, key = payload["sort"], payload["key"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if cursor_sort != sort:
+        raise ValueError("Cursor was issued for a different sort")
+
+    checks = CURSOR_KEY_TYPES.get(sort)
+
+    if (
+        checks is None
+        or not isinstance(key, list)
+        or len(key) != len(checks)
+        or not all(check(value) for check, value in zip(checks, key))
+    ):
+        raise ValueError("Invalid cursor")
+
+    return tuple(key)
+
+
+def paginate_dashboard(entries: list, sort: str, limit: int, cursor: str = None) -> dict:
+    """
+    Keyset page over dashboard entries: the cursor holds the sort key
+    of the last entry returned, so pages stay consistent even when
+    skills are added or removed between requests.
+    """
+
+    key = _sort_key(sort)
+    ordered = sorted(entries, key=key)
+
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(ordered, decode_cursor(cursor, sort), key=key)
+
+    items = ordered[start:start + limit]
+
+    next_cursor = None
+    if items and start + limit < len(ordered):
+        next_cursor = encode_cursor(sort, key(items[-1]))
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "total": len(ordered)
+    }
+
+
+# =========================================================
+# 🔹 STREAMING
+# =========================================================
+
+def iter_user_dashboard(user_id: int, db: Session, sort: str = "id",
+                        chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Yield dashboard entries one at a time from a server-side cursor.
+    Memory stays bounded by `chunk_size` rows; each chunk is scored
+    in one vectorized pass.
+    """
+
+    if sort == "name":
+        # Same case-insensitive key as the paginated sort ("name" in
+        # _sort_key); C collation on Postgres so the order is by code
+        # point like Python's, not locale rules
+        name = func.lower(Skill.name)
+        if db.get_bind().dialect.name == "postgresql":
+            name = name.collate("C")
+        order = (name, Skill.id)
+    else:
+        order = (Skill.id,)
+
+    rows = iter(
+        _dashboard_query(user_id, db)
+        .order_by(*order)
+        .yield_per(chunk_size)
+    )
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        yield from build_dashboard_rows(chunk, db)
@@ -1,111 +1,268 @@
-from datetime import date
+from datetime import date, timedelta
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-from skillrot_app.models.skill_history import SkillHistory
 from skillrot_app.models.skill import Skill
 from skillrot_app.models.skill_health_history import SkillHealthHistory
-from skillrot_app.models.subtopic import Subtopic
-from skillrot_app.core.decay_engine import compute_decay_score
+from skillrot_app.models.skill_state import SkillState
+from skillrot_app.core.decay_engine import (
+    compute_decay_score,
+    compute_decay_scores,
+    encode_levels,
+    days_until_below
+)
+from skillrot_app.core.skill_analyzer import REMINDER_HEALTH_THRESHOLD, REMINDER_INACTIVITY_DAYS
+from skillrot_app.services.skill_state_service import get_skill_state, get_skill_states
+from skillrot_app.db.upsert import upsert
+from skillrot_app.services.user_version_service import (
+    bump_user_version,
+    bump_user_versions_for_skills
+)
 
+import numpy as np
+
+# Skills scored per bulk round trip / bulk insert
+BULK_CHUNK_SIZE = 1000
 
-def recalculate_skill_decay(skill: Skill, db: Session):
+
+def save_health_snapshots(rows: list, db: Session):
+    """
+    Upsert today's SkillHealthHistory snapshot for each
+    {"skill_id", "health"} row → at most one row per skill per day.
+    """
 
     today = date.today()
 
-    # -----------------------------------------------------
-    # 1️⃣ Get Practice History
-    # -----------------------------------------------------
-    history = (
-        db.query(SkillHistory)
-        .filter(SkillHistory.skill_id == skill.id)
-        .order_by(SkillHistory.date)
-        .all()
+    upsert(
+        db,
+        SkillHealthHistory,
+        [{**row, "recorded_on": today} for row in rows],
+        index_elements=["skill_id", "recorded_on"],
+        update_columns={"health": None, "recorded_at": func.now()}
     )
 
-    if not history:
-        last_used = skill.learned_date
-        usage_freq = 0
-    else:
-        used_dates = [h.date for h in history if h.usage == 1]
 
-        if used_dates:
-            last_used = max(used_dates)
-        else:
-            last_used = skill.learned_date
+def _usage_frequency(state: SkillState) -> float:
+    if not state.total_sessions:
+        return 0
+    return state.usage_count / max(state.total_sessions, 1)
 
-        total_sessions = len(history)
-        usage_count = len(used_dates)
-        usage_freq = usage_count / max(total_sessions, 1)
 
-    days_since = (today - last_used).days
+def _compute_health(skill: Skill, state: SkillState) -> float:
+
+    today = date.today()
 
     # -----------------------------------------------------
-    # 2️⃣ Practiced Today
+    # 1️⃣ Practice Summary (constant-size state row)
     # -----------------------------------------------------
-    practiced_today = days_since == 0
+    last_used = state.last_used or skill.learned_date
+    usage_freq = _usage_frequency(state)
+
+    days_since = (today - last_used).days
 
     # -----------------------------------------------------
-    # 3️⃣ Get Previous Health
+    # 2️⃣ Previous Health
     # -----------------------------------------------------
-    latest_health_entry = (
-        db.query(SkillHealthHistory)
-        .filter(SkillHealthHistory.skill_id == skill.id)
-        .order_by(SkillHealthHistory.recorded_at.desc())
-        .first()
-    )
-
-    previous_health = (
-        latest_health_entry.health if latest_health_entry else None
-    )
+    previous_health = state.latest_health
 
     # ✅ DEBUG PRINT
     print("DEBUG → previous_health:", previous_health)
 
     # -----------------------------------------------------
-    # 4️⃣ Clean Level
+    # 3️⃣ Clean Level
     # -----------------------------------------------------
     level = skill.level.lower() if skill.level else "intermediate"
 
     # -----------------------------------------------------
-    # 5️⃣ Compute New Score
+    # 4️⃣ Compute Score
     # -----------------------------------------------------
-    score = compute_decay_score(
+    return compute_decay_score(
         days_since_last_use=days_since,
         usage_frequency=usage_freq,
         skill_level=level,
-        previous_health=previous_health,
-        
+        previous_health=previous_health
+    )
+
+
+def next_due_date(skill, state: SkillState, health: float) -> date:
+    """
+    First day the skill can trigger a reminder without further
+    practice: health dropping below REMINDER_HEALTH_THRESHOLD or
+    inactivity exceeding REMINDER_INACTIVITY_DAYS, whichever is first.
+    Decay only depends on days since last use, so this is exact until
+    the next usage write. `health` is the score just computed.
+    """
+
+    # Already under the threshold (e.g. practiced today, still low)
+    if health < REMINDER_HEALTH_THRESHOLD:
+        return date.today()
+
+    last_used = state.last_used or skill.learned_date
+    last_activity = state.last_activity or skill.learned_date
+
+    due = last_activity + timedelta(days=REMINDER_INACTIVITY_DAYS + 1)
+
+    decay_days = days_until_below(
+        REMINDER_HEALTH_THRESHOLD,
+        skill.level,
+        _usage_frequency(state)
+    )
+
+    if decay_days is not None:
+        due = min(due, last_used + timedelta(days=decay_days))
+
+    return due
+
+
+def compute_skill_health(skill: Skill, db: Session) -> float:
+    """
+    Side-effect-free health read: no INSERT, no UPDATE, no commit.
+    Safe for GET handlers and read-only connections. Use
+    recalculate_skill_decay to persist a snapshot.
+    """
+
+    state = get_skill_state(skill.id, db, backfill=False)
+
+    return _compute_health(skill, state)
+
+
+def recalculate_skill_decay(skill: Skill, db: Session):
+
+    state = get_skill_state(skill.id, db)
+
+    score = _compute_health(skill, state)
+
+    # -----------------------------------------------------
+    # 5️⃣ Avoid duplicate same-day entry
+    # -----------------------------------------------------
+    save_health_snapshots([{"skill_id": skill.id, "health": score}], db)
+    state.latest_health = score
+    state.next_due_on = next_due_date(skill, state, score)
+
+    # New snapshot → dashboard trend may change
+    bump_user_version(db, user_id=skill.user_id)
+
+    db.commit()
+
+    return score
+
+
+def score_skills(skills: list, states: dict) -> np.ndarray:
+    """
+    Vectorized _compute_health for many skills.
+
+    `skills` needs id, level and learned_date; `states` maps
+    skill_id → SkillState (or any object with the same fields).
+    Returns scores in the order of `skills`.
+    """
+
+    today = date.today()
+    count = len(skills)
+
+    days = np.empty(count, dtype=np.int64)
+    freq = np.zeros(count)
+    previous = np.full(count, np.nan)
+
+    for i, skill in enumerate(skills):
+        state = states[skill.id]
+        last_used = state.last_used or skill.learned_date
+
+        days[i] = (today - last_used).days
+        freq[i] = _usage_frequency(state)
+
+        if state.latest_health is not None:
+            previous[i] = state.latest_health
+
+    return compute_decay_scores(
+        days,
+        freq,
+        encode_levels([s.level for s in skills]),
+        previous
     )
 
+
+def bulk_recalculate_skill_decay(skills: list, db: Session) -> dict:
+    """
+    Set-based recalculate_skill_decay for a chunk of skills.
+
+    Reads the SkillState rows for the whole chunk in one query
+    (backfilling missing ones from history in two aggregate queries),
+    scores them in memory with the vectorized engine and writes the
+    snapshots in a single bulk upsert.
+
+    Skills whose score equals today's snapshot are not rewritten and
+    don't bump their user's data_version (repeat sweeps within a day
+    leave dashboard caches / ETags alone).
+
+    `skills` only needs id, level and learned_date attributes
+    (ORM rows or query tuples).
+
+    Returns {skill_id: {"health", "last_used", "last_activity"}}.
+    """
+
+    if not skills:
+        return {}
+
+    skill_ids = [s.id for s in skills]
+
+    # -----------------------------------------------------
+    # 1️⃣ Load Skill States
+    # -----------------------------------------------------
+    states = get_skill_states(skill_ids, db)
+
     # -----------------------------------------------------
-    # 6️⃣ Avoid duplicate same-day entry
+    # 2️⃣ Score In Memory
     # -----------------------------------------------------
-    db.add(SkillHealthHistory(
-     skill_id=skill.id,
-     health=score
-    ))
+    scores = score_skills(skills, states)
 
     # -----------------------------------------------------
-    # 7️⃣ Subtopic Auto Decay
+    # 3️⃣ Bulk Snapshot Upsert (changed skills only)
     # -----------------------------------------------------
-    subtopics = (
-        db.query(Subtopic)
-        .filter(Subtopic.skill_id == skill.id)
+    todays = dict(
+        db.query(SkillHealthHistory.skill_id, SkillHealthHistory.health)
+        .filter(
+            SkillHealthHistory.skill_id.in_(skill_ids),
+            SkillHealthHistory.recorded_on == date.today()
+        )
         .all()
     )
 
-    for sub in subtopics:
+    rows = [
+        {"skill_id": skill_id, "health": float(score)}
+        for skill_id, score in zip(skill_ids, scores)
+        if todays.get(skill_id) != float(score)
+    ]
+
+    save_health_snapshots(rows, db)
+
+    state_changes = []
+    for skill, score in zip(skills, scores):
+        state = states[skill.id]
+        health = float(score)
+        due = next_due_date(skill, state, health)
+
+        if state.latest_health != health or state.next_due_on != due:
+            state_changes.append({
+                "skill_id": skill.id,
+                "latest_health": health,
+                "next_due_on": due
+            })
 
-        if sub.last_practiced:
-            sub_days = (today - sub.last_practiced).days
-        else:
-            sub_days = (today - skill.learned_date).days
+    if state_changes:
+        db.execute(update(SkillState), state_changes)
 
-        daily_decay_rate = 0.02
-        decay = min(sub_days * daily_decay_rate, 50)
+    # New snapshot → dashboard trend may change
+    bump_user_versions_for_skills(db, [row["skill_id"] for row in rows])
 
-        new_health = max(0, sub.health_score - decay)
-        sub.health_score = round(new_health, 2)
+    # Read state fields before commit expires them
+    results = {
+        skill.id: {
+            "health": float(score),
+            "last_used": states[skill.id].last_used or skill.learned_date,
+            "last_activity": states[skill.id].last_activity or skill.learned_date
+        }
+        for skill, score in zip(skills, scores)
+    }
 
     db.commit()
 
-    return score
\ No newline at end of file
+    return results
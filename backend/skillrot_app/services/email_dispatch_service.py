@@ -0,0 +1,220 @@
+import uuid
+import random
+from datetime import datetime, timedelta
+from itertools import groupby
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import update, or_, and_
+from sqlalchemy.orm import Session
+from skillrot_app.core.config import settings
+from skillrot_app.models.email_outbox import EmailOutbox
+from skillrot_app.models.reminder import Reminder
+from skillrot_app.services.email_templates import TEMPLATES, render_email
+from skillrot_app.services.email_service import OutboundEmail, SendResult, get_transport
+
+# A "sending" row not resolved within this is assumed orphaned (crash)
+SENDING_LEASE_MINUTES = 10
+
+
+def enqueue_email(db: Session, to_email: str, template: str, context: dict) -> EmailOutbox:
+    """
+    Queue an email. No commit: call inside the transaction that
+    creates whatever the email is about, and link it (e.g.
+    Reminder.email_id) after a flush.
+    """
+
+    subject, _ = render_email(template, context)
+
+    entry = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        template=template,
+        context=context,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+
+    db.add(entry)
+
+    return entry
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter, capped."""
+
+    delay = min(
+        settings.EMAIL_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.EMAIL_BACKOFF_MAX_SECONDS
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _claim(db: Session, limit: int) -> list:
+    """
+    Claim up to `limit` deliverable rows (FOR UPDATE SKIP LOCKED +
+    compare-and-set, like sweep chunks) and return them.
+    """
+
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+
+    claimable = or_(
+        and_(
+            EmailOutbox.status == "pending",
+            EmailOutbox.next_attempt_at <= now
+        ),
+        and_(
+            EmailOutbox.status == "sending",
+            EmailOutbox.claimed_at < now - timedelta(minutes=SENDING_LEASE_MINUTES)
+        )
+    )
+
+    ids = [
+        row[0]
+        for row in (
+            db.query(EmailOutbox.id)
+            .filter(claimable)
+            .order_by(EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+    ]
+
+    if not ids:
+        db.commit()
+        return []
+
+    db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(ids), claimable)
+        .values(status="sending", claimed_by=token, claimed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return (
+        db.query(
+            EmailOutbox.id,
+            EmailOutbox.to_email,
+            EmailOutbox.subject,
+            EmailOutbox.template,
+            EmailOutbox.context,
+            EmailOutbox.attempts
+        )
+        .filter(EmailOutbox.claimed_by == token)
+        .order_by(EmailOutbox.template, EmailOutbox.id)
+        .all()
+    )
+
+
+def _record_outcomes(db: Session, outcomes: list) -> Counter:
+    """
+    Persist (row, SendResult) pairs and flag the reminders of
+    delivered emails.
+    Returns the number of rows per resulting status.
+    """
+
+    now = datetime.utcnow()
+    changes = []
+    delivered = []
+
+    for row, result in outcomes:
+        attempts = row.attempts + 1
+
+        if result.ok:
+            changes.append({
+                "id": row.id,
+                "status": "sent",
+                "attempts": attempts,
+                "sent_at": now,
+                "last_error": None
+            })
+            delivered.append(row.id)
+
+        elif result.retryable and attempts < settings.EMAIL_MAX_ATTEMPTS:
+            changes.append({
+                "id": row.id,
+                "status": "pending",
+                "attempts": attempts,
+                "next_attempt_at": now + timedelta(seconds=backoff_seconds(attempts)),
+                "last_error": result.error
+            })
+
+        else:
+            changes.append({
+                "id": row.id,
+                "status": "failed",
+                "attempts": attempts,
+                "last_error": result.error
+            })
+
+    # Group by key set: bulk UPDATE by primary key needs uniform rows
+    changes.sort(key=lambda change: sorted(change))
+    for _, group in groupby(changes, key=lambda change: sorted(change)):
+        db.execute(update(EmailOutbox), list(group))
+
+    if delivered:
+        db.execute(
+            update(Reminder)
+            .where(Reminder.email_id.in_(delivered))
+            .values(email_sent=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.commit()
+
+    return Counter(change["status"] for change in changes)
+
+
+def dispatch_outbox(db: Session, transport=None, batch_size: int = None,
+                    concurrency: int = None) -> dict:
+    """
+    Deliver queued emails until nothing is deliverable right now.
+
+    Claimed rows are grouped by template and cut into batches (one
+    SendGrid request each); up to `concurrency` batches are in flight
+    at once. Failures are retried with backoff up to
+    EMAIL_MAX_ATTEMPTS, then marked failed.
+    """
+
+    transport = transport or get_transport()
+    batch_size = min(batch_size or settings.EMAIL_BATCH_SIZE, transport.max_batch)
+    concurrency = concurrency or settings.EMAIL_DISPATCH_CONCURRENCY
+
+    totals = Counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        while True:
+            rows = _claim(db, batch_size * concurrency)
+            if not rows:
+                break
+
+            batches = []
+            for template, group in groupby(rows, key=lambda row: row.template):
+                group = list(group)
+                for i in range(0, len(group), batch_size):
+                    batches.append((template, group[i:i + batch_size]))
+
+            def send(batch):
+                template, batch_rows = batch
+                messages = [
+                    OutboundEmail(row.to_email, row.subject, row.context)
+                    for row in batch_rows
+                ]
+                try:
+                    results = transport.send_batch(TEMPLATES[template][1], messages)
+                except Exception as e:
+                    results = [SendResult(False, retryable=True, error=str(e))] * len(messages)
+                return zip(batch_rows, results)
+
+            outcomes = [pair for result in pool.map(send, batches) for pair in result]
+
+            totals.update(_record_outcomes(db, outcomes))
+
+    if totals:
+        print(f"SkillDelta Email dispatch → {dict(totals)}")
+
+    return dict(totals)
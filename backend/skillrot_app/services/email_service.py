@@ -1,79 +1,249 @@
 import os
+import uuid
 import base64
+import smtplib
 import requests
+from pathlib import Path
+from functools import lru_cache
+from dataclasses import dataclass
+from email.message import EmailMessage
 from skillrot_app.core.config import settings
+from skillrot_app.services.email_templates import render, substitutions
 
 
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")
+SENDGRID_URL = "https://api.sendgrid.com/v3/mail/send"
 FROM_EMAIL = settings.EMAIL_ADDRESS
+FROM_NAME = "SkillDelta Alerts"
 
+LOGO_PATH = os.path.abspath(
+    os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "assets",
+        "skilldelta_logo.png"
+    )
+)
 
-def send_email(to_email: str, subject: str, html_body: str) -> bool:
-    try:
-        if not SENDGRID_API_KEY:
-            print("SendGrid API key missing.")
-            return False
 
-        # Attach logo as base64
-        logo_path = os.path.abspath(
-            os.path.join(
-                os.path.dirname(__file__),
-                "..",
-                "assets",
-                "skilldelta_logo.png"
-            )
-        )
+# Read / encoded once per process
+@lru_cache(maxsize=1)
+def _logo_bytes():
+    if not os.path.exists(LOGO_PATH):
+        return None
+
+    with open(LOGO_PATH, "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=1)
+def _logo_attachments() -> tuple:
+    """Inline logo for SendGrid payloads (referenced as cid:skilldelta_logo)."""
+
+    logo = _logo_bytes()
+    if logo is None:
+        return ()
+
+    return ({
+        "content": base64.b64encode(logo).decode(),
+        "type": "image/png",
+        "filename": "skilldelta_logo.png",
+        "disposition": "inline",
+        "content_id": "skilldelta_logo"
+    },)
+
+
+# =========================================================
+# 🔹 BATCH TRANSPORTS (used by the outbox dispatcher)
+# =========================================================
+
+@dataclass
+class OutboundEmail:
+    to_email: str
+    subject: str
+    # Substitution values for the batch's shared template
+    context: dict
+
+
+@dataclass
+class SendResult:
+    ok: bool
+    retryable: bool = False
+    error: str | None = None
+
+
+class SendGridTransport:
+    """
+    One API call per batch: the template goes in `content` once and
+    each recipient is a personalization carrying its own subject and
+    substitutions.
+    """
 
-        attachments = []
+    # SendGrid's personalizations-per-request limit
+    max_batch = 1000
 
-        if os.path.exists(logo_path):
-            with open(logo_path, "rb") as f:
-                encoded_logo = base64.b64encode(f.read()).decode()
+    def __init__(self, api_key: str = None, timeout: float = None):
+        self.api_key = api_key or SENDGRID_API_KEY
+        self.timeout = timeout or settings.EMAIL_HTTP_TIMEOUT_SECONDS
 
-            attachments.append({
-                "content": encoded_logo,
-                "type": "image/png",
-                "filename": "skilldelta_logo.png",
-                "disposition": "inline",
-                "content_id": "skilldelta_logo"
-            })
+    def send_batch(self, html_template: str, messages: list) -> list:
+
+        if not self.api_key:
+            return [SendResult(False, error="SendGrid API key missing")] * len(messages)
 
         data = {
             "personalizations": [
                 {
-                    "to": [{"email": to_email}],
-                    "subject": subject
+                    "to": [{"email": message.to_email}],
+                    "subject": message.subject,
+                    "substitutions": substitutions(message.context)
                 }
+                for message in messages
             ],
             "from": {
                 "email": FROM_EMAIL,
-                "name": "SkillDelta Alerts"
+                "name": FROM_NAME
             },
             "content": [
                 {
                     "type": "text/html",
-                    "value": html_body
+                    "value": html_template
                 }
             ],
-            "attachments": attachments
+            "attachments": list(_logo_attachments())
         }
 
-        response = requests.post(
-            "https://api.sendgrid.com/v3/mail/send",
-            headers={
-                "Authorization": f"Bearer {SENDGRID_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json=data
-        )
+        try:
+            response = requests.post(
+                SENDGRID_URL,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json=data,
+                timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            return [SendResult(False, retryable=True, error=str(e))] * len(messages)
 
         if response.status_code in [200, 202]:
-            print("SkillDelta Email sent via SendGrid.")
-            return True
-        else:
-            print("SendGrid Error:", response.text)
-            return False
-
-    except Exception as e:
-        print("SendGrid Exception:", str(e))
-        return False
+            return [SendResult(True)] * len(messages)
+
+        # Throttling / server errors are worth retrying, 4xx are not
+        retryable = response.status_code == 429 or response.status_code >= 500
+        error = f"SendGrid {response.status_code}: {response.text[:500]}"
+
+        # A 4xx rejects the whole request, usually for one bad
+        # recipient: bisect so only the offending message fails
+        if not retryable and len(messages) > 1:
+            middle = len(messages) // 2
+            return (
+                self.send_batch(html_template, messages[:middle]) +
+                self.send_batch(html_template, messages[middle:])
+            )
+
+        return [SendResult(False, retryable=retryable, error=error)] * len(messages)
+
+
+def _mime_message(to_email: str, subject: str, html_body: str) -> EmailMessage:
+
+    message = EmailMessage()
+    message["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
+    message["To"] = to_email
+    message["Subject"] = subject
+    message.set_content("This email requires an HTML-capable client.")
+    message.add_alternative(html_body, subtype="html")
+
+    logo = _logo_bytes()
+    if logo is not None:
+        message.get_payload()[1].add_related(
+            logo, "image", "png", cid="<skilldelta_logo>"
+        )
+
+    return message
+
+
+class SMTPTransport:
+    """
+    Plain SMTP, one connection per batch. Pointed at a local debug
+    server (e.g. `python -m aiosmtpd -n -l localhost:1025`) it keeps
+    the whole pipeline testable offline.
+    """
+
+    max_batch = 100
+
+    def __init__(self, host: str = None, port: int = None, timeout: float = None):
+        self.host = host or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.timeout = timeout or settings.EMAIL_HTTP_TIMEOUT_SECONDS
+
+    def send_batch(self, html_template: str, messages: list) -> list:
+
+        try:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except OSError as e:
+            return [SendResult(False, retryable=True, error=str(e))] * len(messages)
+
+        results = []
+
+        with smtp:
+            try:
+                if settings.SMTP_USE_TLS:
+                    smtp.starttls()
+                if settings.EMAIL_ADDRESS and settings.EMAIL_PASSWORD:
+                    smtp.login(settings.EMAIL_ADDRESS, settings.EMAIL_PASSWORD)
+            except smtplib.SMTPException as e:
+                return [SendResult(False, retryable=True, error=str(e))] * len(messages)
+
+            for message in messages:
+                html_body = render(html_template, substitutions(message.context))
+
+                try:
+                    smtp.send_message(_mime_message(message.to_email, message.subject, html_body))
+                    results.append(SendResult(True))
+                except smtplib.SMTPRecipientsRefused as e:
+                    results.append(SendResult(False, error=str(e)))
+                except (smtplib.SMTPException, OSError) as e:
+                    results.append(SendResult(False, retryable=True, error=str(e)))
+
+        return results
+
+
+class FileTransport:
+    """Writes each email as an .eml file instead of sending it."""
+
+    max_batch = 1000
+
+    def __init__(self, directory: str = None):
+        self.directory = Path(directory or settings.EMAIL_FILE_DIR)
+
+    def send_batch(self, html_template: str, messages: list) -> list:
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        for message in messages:
+            html_body = render(html_template, substitutions(message.context))
+            path = self.directory / f"{uuid.uuid4().hex}.eml"
+            path.write_bytes(bytes(_mime_message(message.to_email, message.subject, html_body)))
+
+        return [SendResult(True)] * len(messages)
+
+
+TRANSPORTS = {
+    "sendgrid": SendGridTransport,
+    "smtp": SMTPTransport,
+    "file": FileTransport
+}
+
+
+def get_transport():
+
+    transport = TRANSPORTS.get(settings.EMAIL_TRANSPORT)
+
+    if transport is None:
+        raise ValueError(
+            f"Unknown EMAIL_TRANSPORT '{settings.EMAIL_TRANSPORT}'. "
+            f"Valid: {', '.join(TRANSPORTS)}"
+        )
+
+    return transport()
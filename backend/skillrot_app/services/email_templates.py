@@ -0,0 +1,195 @@
+import re
+import html
+from datetime import datetime
+from functools import lru_cache
+
+
+# =========================================================
+# 🔹 TEMPLATES
+# =========================================================
+# Placeholders use SendGrid substitution tags (-name-) so one
+# content block can serve a whole batch of personalizations.
+
+REMINDER_SUBJECT = "⚠️ SkillDelta Alert: '-skill_name-' Needs Your Attention"
+
+REMINDER_HTML = """
+<html>
+  <body style="font-family: Arial, sans-serif;">
+
+    <p>Hello -user_name-,</p>
+
+    <p>Your skill <strong>-skill_name-</strong> is at risk.</p>
+
+    <p>
+      <strong>Current Health:</strong> -health-<br>
+      <strong>Days Since Last Practice:</strong> -days_since-
+    </p>
+
+    <p>Your retention is declining due to natural forgetting.</p>
+
+    <p><strong>We recommend practicing soon.</strong></p>
+
+    <hr>
+
+    <p style="font-size:13px;">
+      Best regards,<br>
+      <strong>SkillDelta Team</strong>
+    </p>
+
+    <img src="cid:skilldelta_logo" width="180" style="margin-top:10px;" />
+
+    <p style="font-size:11px; color:gray; margin-top:15px;">
+      This is an automated email from SkillDelta.<br>
+      Please do not reply to this message.<br><br>
+      © -year- SkillDelta. All rights reserved.
+    </p>
+
+  </body>
+</html>
+"""
+
+DIGEST_SUBJECT = "⚠️ SkillDelta Alert: -skill_count- skills need your attention"
+
+DIGEST_HTML = """
+<html>
+  <body style="font-family: Arial, sans-serif;">
+
+    <p>Hello -user_name-,</p>
+
+    <p>These skills are at risk:</p>
+
+    <table cellpadding="6" style="border-collapse: collapse;">
+      <tr>
+        <th align="left">Skill</th>
+        <th align="left">Current Health</th>
+        <th align="left">Days Since Last Practice</th>
+      </tr>
+-skill_rows_html-
+    </table>
+
+    <p>-more_html-</p>
+
+    <p>Your retention is declining due to natural forgetting.</p>
+
+    <p><strong>We recommend practicing soon.</strong></p>
+
+    <hr>
+
+    <p style="font-size:13px;">
+      Best regards,<br>
+      <strong>SkillDelta Team</strong>
+    </p>
+
+    <img src="cid:skilldelta_logo" width="180" style="margin-top:10px;" />
+
+    <p style="font-size:11px; color:gray; margin-top:15px;">
+      This is an automated email from SkillDelta.<br>
+      Please do not reply to this message.<br><br>
+      © -year- SkillDelta. All rights reserved.
+    </p>
+
+  </body>
+</html>
+"""
+
+DIGEST_ROW_HTML = """      <tr>
+        <td><strong>-skill_name-</strong></td>
+        <td>-health-</td>
+        <td>-days_since-</td>
+      </tr>
+"""
+
+# Rows listed in one digest; keeps it readable and well under
+# SendGrid's per-personalization substitution size limit
+DIGEST_MAX_ROWS = 25
+
+TEMPLATES = {
+    "skill_reminder": (REMINDER_SUBJECT, REMINDER_HTML),
+    "skill_digest": (DIGEST_SUBJECT, DIGEST_HTML)
+}
+
+
+def reminder_context(user_name: str, skill_name: str, health: float, days_since: int) -> dict:
+    return {
+        "user_name": user_name,
+        "skill_name": skill_name,
+        "health": round(health, 2),
+        "days_since": days_since,
+        "year": datetime.now().year
+    }
+
+
+def digest_context(user_name: str, skills: list) -> dict:
+    """`skills`: (skill_name, health, days_since) tuples, most urgent first."""
+
+    rows = "".join(
+        render(DIGEST_ROW_HTML, substitutions({
+            "skill_name": skill_name,
+            "health": round(health, 2),
+            "days_since": days_since
+        }))
+        for skill_name, health, days_since in skills[:DIGEST_MAX_ROWS]
+    )
+
+    hidden = len(skills) - DIGEST_MAX_ROWS
+    more = f"…and {hidden} more." if hidden > 0 else ""
+
+    return {
+        "user_name": user_name,
+        "skill_count": len(skills),
+        "skill_rows_html": rows,
+        "more_html": more,
+        "year": datetime.now().year
+    }
+
+
+# =========================================================
+# 🔹 RENDERING
+# =========================================================
+
+_TAG = re.compile(r"(-[a-z_]+-)")
+
+
+def substitutions(context: dict, escape: bool = True) -> dict:
+    """
+    Context → {"-key-": "value"}; values HTML-escaped for bodies,
+    except keys ending in _html, which already are HTML.
+    """
+
+    return {
+        f"-{key}-": (
+            html.escape(str(value))
+            if escape and not key.endswith("_html")
+            else str(value)
+        )
+        for key, value in context.items()
+    }
+
+
+@lru_cache(maxsize=64)
+def compile_template(text: str) -> tuple:
+    """Split a template once into alternating literal / tag parts."""
+
+    return tuple(_TAG.split(text))
+
+
+def render(text: str, subs: dict) -> str:
+
+    parts = compile_template(text)
+
+    # Odd positions are tags; unknown tags are left as they are
+    return "".join(
+        subs.get(part, part) if i % 2 else part
+        for i, part in enumerate(parts)
+    )
+
+
+def render_email(template: str, context: dict):
+    """Locally rendered (subject, html) — what SendGrid would produce."""
+
+    subject, body = TEMPLATES[template]
+
+    return (
+        render(subject, substitutions(context, escape=False)),
+        render(body, substitutions(context))
+    )
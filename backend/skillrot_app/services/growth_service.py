@@ -1,24 +1,131 @@
+from datetime import date
 from sqlalchemy.orm import Session
 from skillrot_app.models.skill_health_history import SkillHealthHistory
+from skillrot_app.models.skill_health_daily import SkillHealthDaily
 from skillrot_app.models.skill import Skill
-from sqlalchemy import asc
+from skillrot_app.core.downsample import lttb
+from skillrot_app.services.health_rollup_service import daily_aggregates
+from sqlalchemy import func, cast, select, exists, union_all, Date
 
+GROWTH_BUCKETS = ("day", "week", "month")
 
-def get_growth_data(skill_id: int, db: Session):
+
+def get_growth_version(skill_id: int, db: Session):
+    """
+    Cheap validator for get_growth_data: (name, latest snapshot time,
+    snapshot count) in one aggregate query, or None if the skill
+    does not exist.
+    """
+
+    return (
+        db.query(
+            Skill.name,
+            func.max(SkillHealthHistory.recorded_at),
+            func.count(SkillHealthHistory.id)
+        )
+        .outerjoin(SkillHealthHistory, SkillHealthHistory.skill_id == Skill.id)
+        .filter(Skill.id == skill_id)
+        .group_by(Skill.id, Skill.name)
+        .first()
+    )
+
+
+def _bucket_start(bucket: str, column, db: Session):
+    """First day of each row's day / week (Monday) / month bucket, in SQL."""
+
+    if bucket == "day":
+        return column
+
+    if db.get_bind().dialect.name == "sqlite":
+        modifiers = ("weekday 0", "-6 days") if bucket == "week" else ("start of month",)
+        return func.date(column, *modifiers, type_=Date)
+
+    return cast(func.date_trunc(bucket, column), Date)
+
+
+def _daily_series(skill_id: int, start: date = None, end: date = None):
+    """
+    One row per day (day, avg_health, last_health, samples): rolled-up
+    days from skill_health_daily plus raw days the rollup job has not
+    reached yet (today, or anything since its last run).
+    """
+
+    rolled_filters = [SkillHealthDaily.skill_id == skill_id]
+    raw_filters = [
+        SkillHealthHistory.skill_id == skill_id,
+        ~exists().where(
+            SkillHealthDaily.skill_id == SkillHealthHistory.skill_id,
+            SkillHealthDaily.day == SkillHealthHistory.recorded_on
+        )
+    ]
+
+    if start:
+        rolled_filters.append(SkillHealthDaily.day >= start)
+        raw_filters.append(SkillHealthHistory.recorded_on >= start)
+    if end:
+        rolled_filters.append(SkillHealthDaily.day <= end)
+        raw_filters.append(SkillHealthHistory.recorded_on <= end)
+
+    rolled = select(
+        SkillHealthDaily.day,
+        SkillHealthDaily.avg_health,
+        SkillHealthDaily.last_health,
+        SkillHealthDaily.samples
+    ).where(*rolled_filters)
+
+    pending = daily_aggregates(*raw_filters).subquery()
+
+    return union_all(
+        rolled,
+        select(pending.c.day, pending.c.avg_health, pending.c.last_health, pending.c.samples)
+    ).subquery("daily")
+
+
+def get_growth_data(
+    skill_id: int,
+    db: Session,
+    start: date = None,
+    end: date = None,
+    bucket: str = None,
+    points: int = None
+):
+    """
+    Health series for a skill, read from the daily rollup.
+
+    - start / end: inclusive date range
+    - bucket: "day", "week" or "month" → averaged per bucket in SQL
+    - points: LTTB-downsample the series to at most this many points
+
+    Without a bucket each day contributes its last snapshot.
+    """
 
     skill = db.query(Skill).filter(Skill.id == skill_id).first()
 
     if not skill:
         return None
 
-    history = (
-        db.query(SkillHealthHistory)
-        .filter(SkillHealthHistory.skill_id == skill_id)
-        .order_by(asc(SkillHealthHistory.recorded_at))
-        .all()
-    )
+    daily = _daily_series(skill_id, start, end)
+
+    if bucket:
+        period = _bucket_start(bucket, daily.c.day, db).label("period")
+
+        series = (
+            db.query(
+                period,
+                func.sum(daily.c.avg_health * daily.c.samples) / func.sum(daily.c.samples)
+            )
+            .group_by(period)
+            .order_by(period)
+            .all()
+        )
+    else:
+        series = (
+            db.query(daily.c.day, daily.c.last_health)
+            .order_by(daily.c.day)
+            .all()
+        )
 
-    if not history:
+    if not series:
         return {
             "skill": skill.name,
             "current_health": None,
@@ -27,17 +134,32 @@ def get_growth_data(skill_id: int, db: Session):
             "moving_average": None
         }
 
+    # Latest snapshot in range (a bucket average would smooth it)
+    current_health = series[-1][1]
+    if bucket:
+        current_health = (
+            db.query(daily.c.last_health)
+            .order_by(daily.c.day.desc())
+            .limit(1)
+            .scalar()
+        )
+
+    if points and len(series) > points:
+        days = [day.toordinal() for day, _ in series]
+        health = [value for _, value in series]
+        series = [series[i] for i in lttb(days, health, points)]
+
     history_data = []
     health_values = []
 
-    for entry in history:
+    for day, health in series:
         history_data.append({
-            "date": entry.recorded_at.strftime("%Y-%m-%d"),
-            "health": round(entry.health, 2)
+            "date": day.strftime("%Y-%m-%d"),
+            "health": round(health, 2)
         })
-        health_values.append(entry.health)
+        health_values.append(health)
 
-    current_health = round(health_values[-1], 2)
+    current_health = round(current_health, 2)
 
     # 🔹 TREND CALCULATION
     if len(health_values) >= 2:
@@ -60,4 +182,4 @@ def get_growth_data(skill_id: int, db: Session):
         "trend": trend,
         "history": history_data,
         "moving_average": moving_avg
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from sqlalchemy import select, delete, exists, func
+from sqlalchemy.orm import Session
+from skillrot_app.models.skill_health_history import SkillHealthHistory
+from skillrot_app.models.skill_health_daily import SkillHealthDaily
+from skillrot_app.db.upsert import upsert
+from skillrot_app.core.config import settings
+from skillrot_app.services.decay_service import BULK_CHUNK_SIZE
+
+# Raw snapshots always kept per skill, whatever their age: the dashboard
+# trend compares the last two and skill_state backfills from the latest
+KEEP_LATEST_RAW = 2
+
+
+def daily_aggregates(*filters):
+    """
+    SELECT turning raw snapshots into one row per (skill_id, day):
+    min / max / avg / last health and sample count.
+    Window functions keep it portable (no DISTINCT ON / last()).
+    """
+
+    partition = (SkillHealthHistory.skill_id, SkillHealthHistory.recorded_on)
+    health = SkillHealthHistory.health
+
+    ranked = (
+        select(
+            SkillHealthHistory.skill_id.label("skill_id"),
+            SkillHealthHistory.recorded_on.label("day"),
+            func.min(health).over(partition_by=partition).label("min_health"),
+            func.max(health).over(partition_by=partition).label("max_health"),
+            func.avg(health).over(partition_by=partition).label("avg_health"),
+            health.label("last_health"),
+            func.count(SkillHealthHistory.id).over(partition_by=partition).label("samples"),
+            func.row_number().over(
+                partition_by=partition,
+                order_by=(SkillHealthHistory.recorded_at.desc(), SkillHealthHistory.id.desc())
+            ).label("rn")
+        )
+        .where(*filters)
+        .subquery()
+    )
+
+    return (
+        select(
+            ranked.c.skill_id,
+            ranked.c.day,
+            ranked.c.min_health,
+            ranked.c.max_health,
+            ranked.c.avg_health,
+            ranked.c.last_health,
+            ranked.c.samples
+        )
+        .where(ranked.c.rn == 1)
+    )
+
+
+def rollup_health_history(db: Session, until: date = None) -> int:
+    """
+    Upsert daily rollups for closed days (recorded_on < until, default
+    today). Incremental: starts from the newest rolled-up day, which is
+    re-rolled so a partial previous run is completed. Idempotent.
+    """
+
+    until = until or date.today()
+
+    filters = [SkillHealthHistory.recorded_on < until]
+
+    since = db.query(func.max(SkillHealthDaily.day)).scalar()
+    if since:
+        filters.append(SkillHealthHistory.recorded_on >= since)
+
+    result = db.execute(
+        daily_aggregates(*filters),
+        execution_options={"yield_per": BULK_CHUNK_SIZE}
+    )
+
+    rolled = 0
+
+    for partition in result.mappings().partitions():
+        rows = [dict(row) for row in partition]
+
+        upsert(
+            db,
+            SkillHealthDaily,
+            rows,
+            index_elements=["skill_id", "day"],
+            update_columns={
+                "min_health": None,
+                "max_health": None,
+                "avg_health": None,
+                "last_health": None,
+                "samples": None
+            }
+        )
+        rolled += len(rows)
+
+    db.commit()
+
+    return rolled
+
+
+def compact_health_history(db: Session, retention_days: int = None) -> int:
+    """
+    Delete raw snapshots older than the retention window whose day is
+    already rolled up, keeping the latest KEEP_LATEST_RAW per skill.
+    """
+
+    if retention_days is None:
+        retention_days = settings.HEALTH_HISTORY_RETENTION_DAYS
+
+    cutoff = date.today() - timedelta(days=retention_days)
+
+    ranked = (
+        select(
+            SkillHealthHistory.id.label("id"),
+            func.row_number().over(
+                partition_by=SkillHealthHistory.skill_id,
+                order_by=(SkillHealthHistory.recorded_at.desc(), SkillHealthHistory.id.desc())
+            ).label("rn")
+        )
+        .subquery()
+    )
+
+    rolled_up = exists().where(
+        SkillHealthDaily.skill_id == SkillHealthHistory.skill_id,
+        SkillHealthDaily.day == SkillHealthHistory.recorded_on
+    )
+
+    result = db.execute(
+        delete(SkillHealthHistory)
+        .where(
+            SkillHealthHistory.recorded_on < cutoff,
+            SkillHealthHistory.id.in_(
+                select(ranked.c.id).where(ranked.c.rn > KEEP_LATEST_RAW)
+            ),
+            rolled_up
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    db.commit()
+
+    return result.rowcount
+
+
+def run_health_rollup(db: Session):
+
+    rolled = rollup_health_history(db)
+    compacted = compact_health_history(db)
+
+    print(f"SkillDelta Health rollup → rolled up: {rolled}, compacted: {compacted}")
@@ -3,10 +3,21 @@ from skillrot_app.services.plan_service import generate_refresh_plan
 from skillrot_app.llm.llm_client import call_llm
 from skillrot_app.llm.prompt_builder import build_prompt
 from skillrot_app.services.wikipedia_service import fetch_wikipedia_article
-from skillrot_app.models.subtopic import Subtopic  # 🔥 if you create subtopic model
+from skillrot_app.services.subtopic_service import get_subtopic_health
+from skillrot_app.core.config import settings
 from sqlalchemy.orm import Session
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+# Shared across requests: a per-request pool would block on exit
+# until its slowest lookup finished, defeating the deadline
+_fetch_pool = ThreadPoolExecutor(
+    max_workers=settings.RECOMMENDATION_FETCH_WORKERS,
+    thread_name_prefix="recommendation-fetch"
+)
 
 
 # 🔹 STEP 1 — Convert Health → Learning Level
@@ -20,7 +31,7 @@ def health_to_level(health: float) -> str:
 
 
 # 🔹 STEP 2 — Ask LLM for ONE weak subtopic
-def get_weak_subtopic_from_llm(skill_name: str, level: str) -> str:
+def get_weak_subtopic_from_llm(skill_name: str, level: str, timeout: float = None) -> str:
 
     prompt = f"""
     A student is at {level} level in {skill_name}.
@@ -28,14 +39,14 @@ def get_weak_subtopic_from_llm(skill_name: str, level: str) -> str:
     Return only the topic name. No explanation.
     """
 
-    response = call_llm(prompt)
+    response = call_llm(prompt, timeout=timeout)
 
     if response:
-        try:
-            content = response["choices"][0]["message"]["content"].strip()
-            return content.replace('"', '').strip()
-        except Exception:
-            pass
+        # call_llm returns the message text
+        content = response.strip().split("\n")[0]
+        content = content.replace('"', '').strip()
+        if content:
+            return content
 
     # 🔒 Safe fallback
     if level == "beginner":
@@ -48,35 +59,39 @@ def get_weak_subtopic_from_llm(skill_name: str, level: str) -> str:
 
 # 🔹 STEP 3 — If subtopics exist, pick weakest
 def get_weakest_subtopic_from_db(skill_id: int, db: Session):
-    subtopics = (
-        db.query(Subtopic)
-        .filter(Subtopic.skill_id == skill_id)
-        .order_by(Subtopic.health_score.asc())
-        .all()
-    )
+    subtopics = get_subtopic_health([skill_id], db)
 
     if subtopics:
-        return subtopics[0].name  # weakest one
+        return min(subtopics, key=lambda s: s["health"])["name"]  # weakest one
 
     return None
 
 
-def generate_recommendation(skill, health, status, db: Session):
-
-    # 🔹 STEP 1 — Convert health to level
-    level = health_to_level(health)
+def fetch_resources(focus_topic: str, timeout: float) -> list:
+    """
+    Query YouTube and Wikipedia concurrently and keep whatever
+    answered within `timeout` seconds. Videos first, then the article.
+    """
 
-    # 🔹 STEP 2 — Try DB subtopics first
-    focus_topic = get_weakest_subtopic_from_db(skill.id, db)
+    youtube = _fetch_pool.submit(fetch_youtube_videos, focus_topic, 3)
+    wiki = _fetch_pool.submit(fetch_wikipedia_article, focus_topic)
 
-    # 🔹 STEP 3 — If none exist, ask LLM
-    if not focus_topic:
-        focus_topic = get_weak_subtopic_from_llm(skill.name, level)
+    wait([youtube, wiki], timeout=max(timeout, 0))
 
-    # 🔹 STEP 4 — Fetch Resources
+    def result(future, default):
+        if not future.done():
+            # Too late: let it finish in the background, unused
+            future.cancel()
+            print("Recommendation lookup missed the deadline.")
+            return default
+        try:
+            return future.result()
+        except Exception as e:
+            print("Recommendation lookup failed:", e)
+            return default
 
-    youtube_resources = fetch_youtube_videos(focus_topic, max_results=3)
-    wiki_article = fetch_wikipedia_article(focus_topic)
+    youtube_resources = result(youtube, [])
+    wiki_article = result(wiki, None)
 
     resources = []
 
@@ -87,20 +102,49 @@ def generate_recommendation(skill, health, status, db: Session):
     if wiki_article:
         resources.append(wiki_article)
 
+    return resources
+
+
+def generate_recommendation(skill, health, status, db: Session):
+
+    deadline = time.monotonic() + settings.RECOMMENDATION_DEADLINE_SECONDS
+
+    def remaining() -> float:
+        return deadline - time.monotonic()
+
+    # 🔹 STEP 1 — Convert health to level
+    level = health_to_level(health)
+
+    # 🔹 STEP 2 — Try DB subtopics first
+    focus_topic = get_weakest_subtopic_from_db(skill.id, db)
+
+    # 🔹 STEP 3 — If none exist, ask LLM
+    if not focus_topic:
+        # At most half the budget, so the lookups keep some
+        focus_topic = get_weak_subtopic_from_llm(
+            skill.name, level, timeout=remaining() / 2
+        )
+
+    # 🔹 STEP 4 — Fetch Resources (concurrently, within the budget)
+    resources = fetch_resources(focus_topic, timeout=remaining())
+
     # 🔹 STEP 5 — Generate Study Plan
     plan = generate_refresh_plan(status, health)
 
     # 🔹 STEP 6 — Explanation LLM
-    explanation_prompt = build_prompt(skill.name, health, status, resources)
-    explanation_response = call_llm(explanation_prompt)
+    explanation_response = None
+
+    # Out of time → static fallback explanation below
+    if remaining() > 0:
+        explanation_prompt = build_prompt(skill.name, health, status, resources)
+        explanation_response = call_llm(explanation_prompt, timeout=remaining())
 
     reason = None
     tips = None
 
     if explanation_response:
         try:
-            content = explanation_response["choices"][0]["message"]["content"]
-            data = json.loads(content)
+            data = json.loads(explanation_response)
 
             reason = data.get("reason")
             tips = data.get("tips")
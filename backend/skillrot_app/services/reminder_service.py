@@ -1,15 +1,215 @@
 from datetime import datetime, timedelta, date
+from itertools import groupby
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, or_, and_, exists, update
 from sqlalchemy.orm import Session
+from skillrot_app.core.config import settings
+from skillrot_app.core.skill_analyzer import REMINDER_HEALTH_THRESHOLD, REMINDER_INACTIVITY_DAYS
 from skillrot_app.models.skill import Skill
 from skillrot_app.models.skill_history import SkillHistory
 from skillrot_app.models.reminder import Reminder
 from skillrot_app.models.user import User
-from skillrot_app.services.decay_service import recalculate_skill_decay
-from skillrot_app.services.email_service import send_email
+from skillrot_app.models.skill_state import SkillState
+from skillrot_app.services.decay_service import (
+    recalculate_skill_decay,
+    bulk_recalculate_skill_decay,
+    BULK_CHUNK_SIZE
+)
+from skillrot_app.models.email_outbox import EmailOutbox
+from skillrot_app.services.skill_state_service import defer_next_due
+from skillrot_app.services.email_templates import (
+    reminder_context,
+    digest_context
+)
+from skillrot_app.services.email_dispatch_service import enqueue_email
+from skillrot_app.services.user_version_service import (
+    bump_user_version,
+    bump_user_versions_for_skills
+)
+from skillrot_app.services.sweep_service import (
+    plan_sweep,
+    claim_chunk,
+    renew_chunk,
+    finish_chunk,
+    cleanup_sweeps,
+    worker_name
+)
 
 
-HEALTH_THRESHOLD = 50
-INACTIVITY_DAYS = 14
+HEALTH_THRESHOLD = REMINDER_HEALTH_THRESHOLD
+INACTIVITY_DAYS = REMINDER_INACTIVITY_DAYS
+
+
+def _queue_reminders(db: Session, entries: list) -> int:
+    """
+    Create Reminder rows and, unless REMINDER_DIGEST is on, queue one
+    email per reminder in the outbox. In digest mode the rows wait
+    (email_id NULL) for queue_digests.
+    `entries` are (user_id, user_name, user_email, skill_id,
+    skill_name, health, days_since) tuples. No commit: the caller
+    commits, so reminders and emails land atomically. The dispatcher
+    sets Reminder.email_sent once delivered.
+    """
+
+    reminders = []
+
+    for user_id, _, _, skill_id, skill_name, health, _ in entries:
+        reminder = Reminder(
+            user_id=user_id,
+            skill_id=skill_id,
+            message=f"Skill '{skill_name}' needs attention. Health: {health}",
+            email_sent=False
+        )
+        db.add(reminder)
+        reminders.append(reminder)
+
+    if settings.REMINDER_DIGEST:
+        return len(reminders)
+
+    emails = [
+        enqueue_email(
+            db,
+            user_email,
+            "skill_reminder",
+            reminder_context(user_name, skill_name, health, days_since)
+        )
+        for _, user_name, user_email, _, skill_name, health, days_since in entries
+    ]
+
+    # One flush for all outbox ids
+    db.flush()
+
+    for reminder, email in zip(reminders, emails):
+        reminder.email_id = email.id
+
+    return len(reminders)
+
+
+def _dedupe_window_closes(created_at) -> date:
+    """Day a reminder created at `created_at` stops blocking a new one."""
+
+    return (created_at + timedelta(hours=24)).date()
+
+
+def _recently_reminded():
+    """
+    Reminder filter for the 24h dedupe: delivered, waiting for the
+    next digest, or still queued / retrying in the outbox (only
+    permanent failures allow a new one).
+    """
+
+    in_flight = exists().where(
+        EmailOutbox.id == Reminder.email_id,
+        EmailOutbox.status != "failed"
+    )
+
+    return and_(
+        Reminder.created_at >= datetime.utcnow() - timedelta(hours=24),
+        or_(
+            Reminder.email_sent == True,
+            Reminder.email_id == None,
+            in_flight
+        )
+    )
+
+
+def queue_digests(db: Session) -> int:
+    """
+    Queue one "skill_digest" email per user covering all of their
+    reminders that are still waiting for an email, and link those
+    reminders to it. Returns the number of digests queued.
+    """
+
+    today = date.today()
+
+    waiting = and_(
+        Reminder.email_id == None,
+        Reminder.email_sent == False,
+        Reminder.created_at >= datetime.utcnow() - timedelta(hours=24)
+    )
+
+    # 🔒 Lock the users first: a concurrent run skips them instead of
+    # building a second digest from the same reminders
+    user_ids = [
+        row.id
+        for row in db.query(User.id)
+        .filter(User.id.in_(db.query(Reminder.user_id).filter(waiting)))
+        .order_by(User.id)
+        .with_for_update(skip_locked=True)
+        .all()
+    ]
+
+    if not user_ids:
+        db.rollback()
+        return 0
+
+    pending = (
+        db.query(
+            Reminder.id,
+            Reminder.user_id,
+            User.name.label("user_name"),
+            User.email.label("user_email"),
+            Skill.name.label("skill_name"),
+            SkillState.latest_health,
+            func.coalesce(SkillState.last_activity, Skill.learned_date).label("last_activity")
+        )
+        .join(User, User.id == Reminder.user_id)
+        .join(Skill, Skill.id == Reminder.skill_id)
+        .outerjoin(SkillState, SkillState.skill_id == Reminder.skill_id)
+        .filter(Reminder.user_id.in_(user_ids), waiting)
+        .order_by(Reminder.user_id, SkillState.latest_health, Reminder.id)
+        .all()
+    )
+
+    if not pending:
+        db.rollback()
+        return 0
+
+    links = []
+
+    for _, rows in groupby(pending, key=lambda row: row.user_id):
+        rows = list(rows)
+
+        skills = [
+            (
+                row.skill_name,
+                row.latest_health or 0.0,
+                (today - row.last_activity).days if row.last_activity else 0
+            )
+            for row in rows
+        ]
+
+        email = enqueue_email(
+            db,
+            rows[0].user_email,
+            "skill_digest",
+            digest_context(rows[0].user_name, skills)
+        )
+        links.append((email, [row.id for row in rows]))
+
+    # One flush for all outbox ids
+    db.flush()
+
+    for email, reminder_ids in links:
+        result = db.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(reminder_ids), Reminder.email_id == None)
+            .values(email_id=email.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Where row locks are a no-op (SQLite), the link is the
+        # compare-and-set: losing any reminder drops this whole run
+        if result.rowcount != len(reminder_ids):
+            db.rollback()
+            print("SkillDelta Reminder digests already queued by another run")
+            return 0
+
+    db.commit()
+
+    print(f"SkillDelta Reminder digests queued: {len(links)}")
+
+    return len(links)
 
 
 def check_and_create_reminders(db: Session):
@@ -43,76 +243,269 @@ def check_and_create_reminders(db: Session):
         if health < HEALTH_THRESHOLD or days_since > INACTIVITY_DAYS:
 
             # ✅ Avoid duplicate reminder within 24h
-            recent_reminder = (
-                db.query(Reminder)
+            last_reminded = (
+                db.query(func.max(Reminder.created_at))
                 .filter(
                     Reminder.skill_id == skill.id,
-                    Reminder.created_at >= datetime.utcnow() - timedelta(hours=24),
-                    Reminder.email_sent == True
+                    _recently_reminded()
                 )
-                .first()
+                .scalar()
             )
 
-            if recent_reminder:
-                print("Recent successful reminder exists. Skipping.")
+            # Reminded (now or within 24h): not due again before the
+            # day that reminder's dedupe window closes
+            defer_next_due(
+                {skill.id: _dedupe_window_closes(last_reminded or datetime.utcnow())},
+                db
+            )
+
+            if last_reminded:
+                print("Recent reminder exists. Skipping.")
+                db.commit()
                 continue
 
-            message = f"Skill '{skill.name}' needs attention. Health: {health}"
+            _queue_reminders(db, [(
+                user.id, user.name, user.email,
+                skill.id, skill.name, health, days_since
+            )])
+            bump_user_version(db, user_id=user.id)
+            db.commit()
 
-            reminder = Reminder(
-                user_id=user.id,
-                skill_id=skill.id,
-                message=message,
-                email_sent=False
-            )
+    if settings.REMINDER_DIGEST:
+        queue_digests(db)
 
-            db.add(reminder)
-            db.commit()
 
-            # 🔥 Professional SkillDelta HTML Email
-            subject = f"⚠️ SkillDelta Alert: '{skill.name}' Needs Your Attention"
+def _reminder_candidates(db: Session):
+    return (
+        db.query(
+            Skill.id,
+            Skill.name,
+            Skill.level,
+            Skill.learned_date,
+            Skill.user_id,
+            User.name.label("user_name"),
+            User.email.label("user_email")
+        )
+        .join(User, User.id == Skill.user_id)
+    )
+
+
+def _process_reminder_chunk(chunk: list, db: Session) -> int:
+    """
+    Recalculate health for a chunk of candidate rows and queue the
+    reminders that are due (one commit). Returns the number queued.
+    """
 
-            html_body = f"""
-<html>
-  <body style="font-family: Arial, sans-serif;">
+    today = date.today()
 
-    <p>Hello {user.name},</p>
+    # 🔥 Recalculate health for the whole chunk
+    results = bulk_recalculate_skill_decay(chunk, db)
 
-    <p>Your skill <strong>{skill.name}</strong> is at risk.</p>
+    due = []
+    for skill in chunk:
+        result = results[skill.id]
+        days_since = (today - result["last_activity"]).days
 
-    <p>
-      <strong>Current Health:</strong> {round(health, 2)}<br>
-      <strong>Days Since Last Practice:</strong> {days_since}
-    </p>
+        if result["health"] < HEALTH_THRESHOLD or days_since > INACTIVITY_DAYS:
+            due.append((skill, result["health"], days_since))
 
-    <p>Your retention is declining due to natural forgetting.</p>
+    if not due:
+        return 0
 
-    <p><strong>We recommend practicing soon.</strong></p>
+    # ✅ Avoid duplicate reminder within 24h (one query per chunk)
+    recently_reminded = dict(
+        db.query(Reminder.skill_id, func.max(Reminder.created_at))
+        .filter(
+            Reminder.skill_id.in_([skill.id for skill, _, _ in due]),
+            _recently_reminded()
+        )
+        .group_by(Reminder.skill_id)
+        .all()
+    )
 
-    <hr>
+    entries = [
+        (
+            skill.user_id, skill.user_name, skill.user_email,
+            skill.id, skill.name, health, days_since
+        )
+        for skill, health, days_since in due
+        if skill.id not in recently_reminded
+    ]
 
-    <p style="font-size:13px;">
-      Best regards,<br>
-      <strong>SkillDelta Team</strong>
-    </p>
+    # Reminded (now or within 24h): keep due-only sweeps off these
+    # skills until the day their dedupe window closes instead of
+    # re-scoring them every hour
+    now = datetime.utcnow()
+    defer_next_due(
+        {
+            skill.id: _dedupe_window_closes(recently_reminded.get(skill.id, now))
+            for skill, _, _ in due
+        },
+        db
+    )
 
-    <img src="cid:skilldelta_logo" width="180" style="margin-top:10px;" />
+    if not entries:
+        db.commit()
+        return 0
 
-    <p style="font-size:11px; color:gray; margin-top:15px;">
-      This is an automated email from SkillDelta.<br>
-      Please do not reply to this message.<br><br>
-      © {datetime.now().year} SkillDelta. All rights reserved.
-    </p>
+    queued = _queue_reminders(db, entries)
+    bump_user_versions_for_skills(db, [entry[3] for entry in entries])
+    db.commit()
 
-  </body>
-</html>
-"""
+    return queued
 
-            success = send_email(user.email, subject, html_body)
 
-            if success:
-                reminder.email_sent = True
-                db.commit()
-                print("SkillDelta Email sent successfully.")
-            else:
-                print("SkillDelta Email sending failed.")
\ No newline at end of file
+def process_reminder_range(db: Session, start_id: int, end_id: int,
+                           chunk_size: int = BULK_CHUNK_SIZE, due_only: bool = False,
+                           keep_going=None):
+    """
+    Reminder check for skills with start_id <= id <= end_id, walked
+    in keyset chunks. Returns (checked, sent).
+
+    due_only: skip skills whose skill_state.next_due_on is in the future.
+    keep_going: called before each keyset chunk; False → stop early
+    (e.g. the sweep chunk's lease was lost).
+    """
+
+    last_id = start_id - 1
+    checked = 0
+    sent = 0
+
+    query = _reminder_candidates(db)
+
+    if due_only:
+        query = (
+            query
+            .outerjoin(SkillState, SkillState.skill_id == Skill.id)
+            .filter(or_(
+                SkillState.next_due_on == None,
+                SkillState.next_due_on <= date.today()
+            ))
+        )
+
+    while True:
+
+        if keep_going is not None and not keep_going():
+            break
+
+        chunk = (
+            query
+            .filter(Skill.id > last_id, Skill.id <= end_id)
+            .order_by(Skill.id)
+            .limit(chunk_size)
+            .all()
+        )
+
+        if not chunk:
+            break
+
+        last_id = chunk[-1].id
+        checked += len(chunk)
+        sent += _process_reminder_chunk(chunk, db)
+
+    return checked, sent
+
+
+def check_and_create_reminders_bulk(db: Session, chunk_size: int = BULK_CHUNK_SIZE):
+    """
+    Set-based variant of check_and_create_reminders.
+
+    Walks skills in id order, chunk by chunk. Each chunk is scored
+    with a handful of aggregate queries and one bulk snapshot upsert;
+    only skills that actually need a reminder cost extra round trips.
+    """
+
+    max_id = db.query(func.max(Skill.id)).scalar() or 0
+
+    checked, sent = process_reminder_range(db, 1, max_id, chunk_size)
+
+    print(f"SkillDelta Reminder sweep → checked: {checked}, reminders: {sent}")
+
+    if settings.REMINDER_DIGEST:
+        queue_digests(db)
+
+
+def run_reminder_worker(session_factory, sweep_id: str, due_only: bool = False,
+                        lease_minutes: int = None):
+    """
+    Claim and process chunks of `sweep_id` until none are left.
+    Uses its own session. Returns (checked, sent).
+    """
+
+    if lease_minutes is None:
+        lease_minutes = settings.REMINDER_SWEEP_LEASE_MINUTES
+
+    worker = worker_name()
+    checked = 0
+    sent = 0
+
+    db = session_factory()
+    try:
+        while True:
+            claimed = claim_chunk(db, sweep_id, worker, lease_minutes)
+            if claimed is None:
+                break
+
+            chunk_id, start_id, end_id, token = claimed
+
+            # Renews the lease as we go; stops if it was reclaimed
+            def still_owner():
+                return renew_chunk(db, chunk_id, token)
+
+            chunk_checked, chunk_sent = process_reminder_range(
+                db, start_id, end_id, due_only=due_only, keep_going=still_owner
+            )
+            checked += chunk_checked
+            sent += chunk_sent
+
+            if not finish_chunk(db, chunk_id, token):
+                print(f"SkillDelta Reminder sweep: lost chunk {chunk_id} to another worker")
+    finally:
+        db.close()
+
+    return checked, sent
+
+
+def run_reminder_sweep(session_factory, workers: int = None, chunk_size: int = None,
+                       due_only: bool = True):
+    """
+    Parallel reminder sweep: plan this hour's chunks, then let
+    `workers` threads claim them. Other processes running the same
+    hourly sweep share the chunk table and split the work with us.
+
+    due_only=True (hourly) only recalculates skills whose next_due_on
+    has arrived; due_only=False (daily) touches every skill, which
+    also refreshes every daily snapshot and due date.
+    """
+
+    workers = workers or settings.REMINDER_SWEEP_WORKERS
+    chunk_size = chunk_size or settings.REMINDER_SWEEP_CHUNK_SIZE
+
+    mode = "due" if due_only else "full"
+    sweep_id = f"reminders:{mode}:{datetime.utcnow():%Y-%m-%dT%H}"
+
+    db = session_factory()
+    try:
+        cleanup_sweeps(db)
+        plan_sweep(db, sweep_id, chunk_size)
+    finally:
+        db.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda _: run_reminder_worker(session_factory, sweep_id, due_only),
+            range(workers)
+        ))
+
+    checked = sum(r[0] for r in results)
+    sent = sum(r[1] for r in results)
+
+    print(f"SkillDelta Reminder sweep {sweep_id} → checked: {checked}, reminders: {sent}")
+
+    # After all workers: one digest per user for everything this sweep found
+    if settings.REMINDER_DIGEST:
+        db = session_factory()
+        try:
+            queue_digests(db)
+        finally:
+            db.close()
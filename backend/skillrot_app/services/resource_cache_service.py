@@ -0,0 +1,249 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import update, delete
+from sqlalchemy.orm import Session
+from skillrot_app.core.cache import TTLCache, SingleFlight
+from skillrot_app.core.config import settings
+from skillrot_app.db.database import SessionLocal
+from skillrot_app.db.upsert import upsert
+from skillrot_app.models.resource_cache import ResourceCacheEntry
+
+# A refresh not stored within this is retried by whoever sees it next
+REFRESH_CLAIM_SECONDS = 60
+
+# Background stale-while-revalidate refreshes, shared by all caches
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="resource-refresh")
+
+
+def normalize_key(topic: str) -> str:
+    """Case / whitespace-insensitive cache key."""
+    return " ".join(topic.lower().split())
+
+
+@dataclass
+class CachedResource:
+    value: object
+    fresh_until: datetime
+    stale_until: datetime
+
+
+class ResourceCache:
+    """
+    Two-tier cache for external lookups (YouTube, Wikipedia, LLM):
+
+    - in-process bounded LRU (TTLCache), in front of
+    - the shared `resource_cache` table, so workers and restarts
+      reuse each other's results (and API quota).
+
+    Empty results are cached too, for the shorter negative TTL.
+    Entries past their TTL are still returned for up to
+    RESOURCE_CACHE_STALE_SECONDS while one background refresh
+    (claimed in the table, so one per cluster) replaces them.
+
+    `fetch` must raise on transient failures so outages are not
+    cached as "nothing found". TTLs default to the RESOURCE_CACHE_*
+    settings; stale=0 disables stale serving.
+    """
+
+    def __init__(self, namespace: str, session_factory=SessionLocal,
+                 memory_size: int = None, memory_ttl: float = None,
+                 ttl: float = None, negative_ttl: float = None, stale: float = None):
+        self.namespace = namespace
+        self.session_factory = session_factory
+        self.ttl = settings.RESOURCE_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.negative_ttl = (
+            settings.RESOURCE_CACHE_NEGATIVE_TTL_SECONDS
+            if negative_ttl is None else negative_ttl
+        )
+        self.stale = settings.RESOURCE_CACHE_STALE_SECONDS if stale is None else stale
+        self.memory_ttl = memory_ttl or settings.RESOURCE_CACHE_MEMORY_TTL_SECONDS
+        self.memory = TTLCache(
+            memory_size or settings.RESOURCE_CACHE_MEMORY_SIZE,
+            self.memory_ttl
+        )
+        self.flight = SingleFlight()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_or_fetch(self, topic: str, fetch, timeout: float = None):
+        """
+        `timeout` bounds how long this caller waits on someone else's
+        in-flight fetch of the same key (TimeoutError on expiry).
+        """
+
+        key = normalize_key(topic)
+        now = datetime.utcnow()
+
+        entry = self.memory.get(key)
+
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is not None:
+            if now < entry.fresh_until:
+                return entry.value
+
+            if now < entry.stale_until:
+                self._refresh_in_background(key, entry, fetch)
+                return entry.value
+
+        # Miss: concurrent callers for the same key share one fetch
+        return self.flight.do(
+            key,
+            lambda: self._fetch_and_store(key, fetch).value,
+            timeout=timeout
+        )
+
+    # -----------------------------------------------------
+    # Tiers
+    # -----------------------------------------------------
+    def _remember(self, key: str, entry: CachedResource):
+
+        ttl = min(
+            self.memory_ttl,
+            (entry.stale_until - datetime.utcnow()).total_seconds()
+        )
+
+        if ttl > 0:
+            self.memory.set(key, entry, ttl=ttl)
+
+    def _load(self, key: str):
+
+        # The table is an optimization: if it's unavailable, fetch
+        try:
+            db = self.session_factory()
+            try:
+                row = db.get(ResourceCacheEntry, (self.namespace, key))
+            finally:
+                db.close()
+        except Exception as e:
+            print("Resource cache read failed:", e)
+            return None
+
+        if row is None or row.stale_until <= datetime.utcnow():
+            return None
+
+        return CachedResource(row.value, row.fresh_until, row.stale_until)
+
+    def _fetch_and_store(self, key: str, fetch) -> CachedResource:
+
+        value = fetch()
+        now = datetime.utcnow()
+
+        if value:
+            fresh_until = now + timedelta(seconds=self.ttl)
+            stale_until = fresh_until + timedelta(seconds=self.stale)
+        else:
+            # Negative entry: expires outright, never served stale
+            fresh_until = now + timedelta(seconds=self.negative_ttl)
+            stale_until = fresh_until
+
+        entry = CachedResource(value, fresh_until, stale_until)
+        self._remember(key, entry)
+
+        try:
+            db = self.session_factory()
+            try:
+                upsert(
+                    db,
+                    ResourceCacheEntry,
+                    [{
+                        "namespace": self.namespace,
+                        "key": key,
+                        "value": value,
+                        "fresh_until": fresh_until,
+                        "stale_until": stale_until,
+                        "updated_at": now
+                    }],
+                    index_elements=["namespace", "key"],
+                    update_columns={
+                        "value": None,
+                        "fresh_until": None,
+                        "stale_until": None,
+                        "updated_at": None
+                    }
+                )
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            print("Resource cache write failed:", e)
+
+        return entry
+
+    # -----------------------------------------------------
+    # Stale-while-revalidate
+    # -----------------------------------------------------
+    def _refresh_in_background(self, key: str, entry: CachedResource, fetch):
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        _refresh_pool.submit(self._refresh, key, entry, fetch)
+
+    def _refresh(self, key: str, entry: CachedResource, fetch):
+
+        try:
+            if not self._claim_refresh(key, entry):
+                # Another worker is on it; drop our copy so the next
+                # call picks up its result from the table
+                self.memory.pop(key)
+                return
+
+            self._fetch_and_store(key, fetch)
+
+        except Exception as e:
+            # Keep serving the stale value until it runs out
+            print("Resource cache refresh failed:", e)
+
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _claim_refresh(self, key: str, entry: CachedResource) -> bool:
+        """
+        Compare-and-set on fresh_until: pushes it out briefly so other
+        workers keep serving the stale value instead of refreshing too.
+        """
+
+        try:
+            db = self.session_factory()
+            try:
+                result = db.execute(
+                    update(ResourceCacheEntry)
+                    .where(
+                        ResourceCacheEntry.namespace == self.namespace,
+                        ResourceCacheEntry.key == key,
+                        ResourceCacheEntry.fresh_until == entry.fresh_until
+                    )
+                    .values(
+                        fresh_until=datetime.utcnow() + timedelta(seconds=REFRESH_CLAIM_SECONDS)
+                    )
+                )
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            print("Resource cache claim failed:", e)
+            # Table unavailable: refresh locally anyway
+            return True
+
+        return result.rowcount == 1
+
+
+def purge_resource_cache(db: Session) -> int:
+    """Delete entries too old to be served even stale."""
+
+    result = db.execute(
+        delete(ResourceCacheEntry)
+        .where(ResourceCacheEntry.stale_until < datetime.utcnow())
+    )
+    db.commit()
+
+    return result.rowcount
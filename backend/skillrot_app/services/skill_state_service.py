@@ -0,0 +1,170 @@
+from datetime import date
+from sqlalchemy import func, case, update, or_
+from sqlalchemy.orm import Session
+from skillrot_app.models.skill_history import SkillHistory
+from skillrot_app.models.skill_health_history import SkillHealthHistory
+from skillrot_app.models.skill_state import SkillState
+
+
+def _aggregate_states(skill_ids: list, db: Session) -> list:
+    """
+    Build SkillState rows from the raw history tables
+    (one grouped query + one window query for the whole batch).
+    """
+
+    usage_rows = (
+        db.query(
+            SkillHistory.skill_id,
+            func.max(case((SkillHistory.usage == 1, SkillHistory.date))),
+            func.max(SkillHistory.date),
+            func.count(case((SkillHistory.usage == 1, 1))),
+            func.count(SkillHistory.id)
+        )
+        .filter(SkillHistory.skill_id.in_(skill_ids))
+        .group_by(SkillHistory.skill_id)
+        .all()
+    )
+
+    usage_stats = {row[0]: row[1:] for row in usage_rows}
+
+    ranked = (
+        db.query(
+            SkillHealthHistory.skill_id.label("skill_id"),
+            SkillHealthHistory.health.label("health"),
+            func.row_number().over(
+                partition_by=SkillHealthHistory.skill_id,
+                order_by=SkillHealthHistory.recorded_at.desc()
+            ).label("rn")
+        )
+        .filter(SkillHealthHistory.skill_id.in_(skill_ids))
+        .subquery()
+    )
+
+    latest_health = dict(
+        db.query(ranked.c.skill_id, ranked.c.health)
+        .filter(ranked.c.rn == 1)
+        .all()
+    )
+
+    states = []
+
+    for skill_id in skill_ids:
+        last_used, last_activity, usage_count, total_sessions = usage_stats.get(
+            skill_id, (None, None, 0, 0)
+        )
+
+        states.append(SkillState(
+            skill_id=skill_id,
+            last_used=last_used,
+            last_activity=last_activity,
+            usage_count=usage_count,
+            total_sessions=total_sessions,
+            latest_health=latest_health.get(skill_id)
+        ))
+
+    return states
+
+
+def get_skill_states(skill_ids: list, db: Session, backfill: bool = True) -> dict:
+    """
+    Load SkillState for many skills, backfilling any missing rows
+    from history. Returns {skill_id: SkillState}.
+
+    With backfill=False missing states are computed but returned as
+    transient objects → the call never writes.
+    """
+
+    if not skill_ids:
+        return {}
+
+    states = {
+        state.skill_id: state
+        for state in (
+            db.query(SkillState)
+            .filter(SkillState.skill_id.in_(skill_ids))
+            .all()
+        )
+    }
+
+    missing = [skill_id for skill_id in skill_ids if skill_id not in states]
+
+    if missing:
+        for state in _aggregate_states(missing, db):
+            if backfill:
+                db.add(state)
+            states[state.skill_id] = state
+
+        if backfill:
+            db.flush()
+
+    return states
+
+
+def get_skill_state(skill_id: int, db: Session, backfill: bool = True) -> SkillState:
+    return get_skill_states([skill_id], db, backfill=backfill)[skill_id]
+
+
+def record_usage(skill_id: int, usage_date: date, usage: int, db: Session) -> SkillState:
+    """
+    Fold one new SkillHistory entry into the skill's state.
+
+    Call after db.add(SkillHistory(...)) and before commit so the
+    state changes in the same transaction as the history row.
+    """
+
+    state = db.get(SkillState, skill_id)
+
+    if state is None:
+        # First touch → backfill from history (includes the new row)
+        db.flush()
+        return get_skill_state(skill_id, db)
+
+    # Atomic increments (safe under concurrent writers)
+    state.total_sessions = SkillState.total_sessions + 1
+
+    if usage == 1:
+        state.usage_count = SkillState.usage_count + 1
+
+        if state.last_used is None or usage_date > state.last_used:
+            state.last_used = usage_date
+
+    if state.last_activity is None or usage_date > state.last_activity:
+        state.last_activity = usage_date
+
+    # Usage frequency changed → due date unknown until recalculated
+    state.next_due_on = None
+
+    return state
+
+
+def defer_next_due(due_on: dict, db: Session):
+    """
+    Push next_due_on out (never earlier) for skills the reminder sweep
+    just handled, so due-only sweeps skip them until another reminder
+    is possible. `due_on` maps skill_id → date. No commit.
+    """
+
+    by_date = {}
+    for skill_id, due in due_on.items():
+        by_date.setdefault(due, []).append(skill_id)
+
+    for due, skill_ids in by_date.items():
+        db.execute(
+            update(SkillState)
+            .where(
+                SkillState.skill_id.in_(skill_ids),
+                or_(SkillState.next_due_on == None, SkillState.next_due_on < due)
+            )
+            .values(next_due_on=due)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def reset_next_due(skill_id: int, db: Session):
+    """Force the next reminder sweep to re-evaluate this skill."""
+
+    db.execute(
+        update(SkillState)
+        .where(SkillState.skill_id == skill_id)
+        .values(next_due_on=None)
+    )
@@ -0,0 +1,119 @@
+from datetime import date
+from sqlalchemy import update, cast, func, Numeric, literal
+from sqlalchemy.orm import Session
+from skillrot_app.models.skill import Skill
+from skillrot_app.models.subtopic import Subtopic
+from skillrot_app.core.decay_engine import (
+    compute_subtopic_scores,
+    SUBTOPIC_DAILY_DECAY,
+    SUBTOPIC_MAX_DECAY
+)
+
+import numpy as np
+
+PRACTICE_BOOST = 10
+
+
+def _anchor_date():
+    return func.coalesce(Subtopic.anchored_on, Subtopic.last_practiced, Skill.learned_date)
+
+
+def _subtopic_health(rows: list) -> list:
+    """
+    rows: (id, skill_id, name, health_score, anchor_date) tuples.
+    Returns dicts with the derived current health.
+    """
+
+    if not rows:
+        return []
+
+    today = date.today()
+
+    scores = compute_subtopic_scores(
+        np.array([row.health_score if row.health_score is not None else 100.0 for row in rows]),
+        np.array([(today - row.anchor_date).days for row in rows])
+    )
+
+    return [
+        {
+            "id": row.id,
+            "skill_id": row.skill_id,
+            "name": row.name,
+            "health": float(score)
+        }
+        for row, score in zip(rows, scores)
+    ]
+
+
+def _subtopic_rows(db: Session):
+    return (
+        db.query(
+            Subtopic.id,
+            Subtopic.skill_id,
+            Subtopic.name,
+            Subtopic.health_score,
+            _anchor_date().label("anchor_date")
+        )
+        .join(Skill, Skill.id == Subtopic.skill_id)
+    )
+
+
+def get_subtopic_health(skill_ids: list, db: Session) -> list:
+    """
+    Current health of every subtopic of the given skills.
+    Derived on read from the stored anchor → no writes.
+    """
+
+    if not skill_ids:
+        return []
+
+    rows = _subtopic_rows(db).filter(Subtopic.skill_id.in_(skill_ids)).all()
+
+    return _subtopic_health(rows)
+
+
+def get_user_subtopic_health(user_id: int, db: Session) -> list:
+    """
+    Current health of all subtopics across a user's skills,
+    one query + one vectorized evaluation.
+    """
+
+    rows = _subtopic_rows(db).filter(Skill.user_id == user_id).all()
+
+    return _subtopic_health(rows)
+
+
+def boost_subtopics(skill_ids: list, db: Session):
+    """
+    Practice boost for every subtopic of the given skills, in a
+    single UPDATE: re-anchor at today with the derived current
+    health + 10 (capped at 100).
+    """
+
+    if not skill_ids:
+        return
+
+    today = date.today()
+
+    # Same rule as compute_subtopic_scores, in SQL
+    days = literal(today) - _anchor_date()
+    decay = func.least(days * SUBTOPIC_DAILY_DECAY, SUBTOPIC_MAX_DECAY)
+    current = func.round(
+        cast(func.greatest(func.coalesce(Subtopic.health_score, 100.0) - decay, 0), Numeric),
+        2
+    )
+
+    # UPDATE subtopics ... FROM skills (joined for learned_date)
+    db.execute(
+        update(Subtopic)
+        .where(
+            Subtopic.skill_id == Skill.id,
+            Skill.id.in_(skill_ids)
+        )
+        .values(
+            health_score=func.least(current + PRACTICE_BOOST, 100),
+            last_practiced=today,
+            anchored_on=today
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,151 @@
+import os
+import uuid
+import socket
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func, or_, and_, update, delete
+from sqlalchemy.orm import Session
+from skillrot_app.models.skill import Skill
+from skillrot_app.models.sweep_chunk import SweepChunk
+from skillrot_app.db.upsert import upsert
+
+# Finished sweeps are kept this long for inspection
+SWEEP_RETENTION_DAYS = 7
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def plan_sweep(db: Session, sweep_id: str, chunk_size: int) -> int:
+    """
+    Split the skill id space into fixed-width ranges for one sweep.
+
+    Ranges are aligned to multiples of chunk_size, so every process
+    that plans the same sweep produces the same chunks; existing ones
+    are left untouched (ON CONFLICT DO NOTHING). Safe to call from
+    every worker.
+    """
+
+    low, high = db.query(func.min(Skill.id), func.max(Skill.id)).one()
+
+    if low is None:
+        return 0
+
+    first = (low // chunk_size) * chunk_size
+
+    rows = [
+        {
+            "sweep_id": sweep_id,
+            "start_id": start,
+            "end_id": start + chunk_size - 1,
+            "status": "pending"
+        }
+        for start in range(first, high + 1, chunk_size)
+    ]
+
+    upsert(db, SweepChunk, rows, index_elements=["sweep_id", "start_id"])
+    db.commit()
+
+    return len(rows)
+
+
+def claim_chunk(db: Session, sweep_id: str, worker: str, lease_minutes: int):
+    """
+    Claim the next pending chunk (or one whose lease ran out).
+
+    FOR UPDATE SKIP LOCKED lets concurrent workers pass over rows
+    another worker is claiming instead of queueing behind it.
+    Returns (chunk_id, start_id, end_id, token) or None when nothing
+    is left. `token` (stored in claimed_by) identifies this claim:
+    renew_chunk / finish_chunk only succeed while it still owns the
+    chunk, so a holder whose lease ran out and was reclaimed stops.
+    """
+
+    stale_before = datetime.utcnow() - timedelta(minutes=lease_minutes)
+
+    claimable = and_(
+        SweepChunk.sweep_id == sweep_id,
+        or_(
+            SweepChunk.status == "pending",
+            and_(
+                SweepChunk.status == "running",
+                SweepChunk.claimed_at < stale_before
+            )
+        )
+    )
+
+    while True:
+
+        token = f"{worker}#{uuid.uuid4().hex[:8]}"
+
+        chunk = (
+            db.query(SweepChunk.id, SweepChunk.start_id, SweepChunk.end_id)
+            .filter(claimable)
+            .order_by(SweepChunk.start_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+
+        if chunk is None:
+            db.commit()
+            return None
+
+        # Compare-and-set: also correct where row locks are unavailable
+        # (SQLite); losing the race just means trying the next chunk
+        result = db.execute(
+            update(SweepChunk)
+            .where(SweepChunk.id == chunk.id, claimable)
+            .values(status="running", claimed_by=token, claimed_at=datetime.utcnow())
+        )
+        db.commit()
+
+        if result.rowcount == 1:
+            return (*chunk, token)
+
+
+def _owned(chunk_id: int, token: str):
+    return and_(
+        SweepChunk.id == chunk_id,
+        SweepChunk.status == "running",
+        SweepChunk.claimed_by == token
+    )
+
+
+def renew_chunk(db: Session, chunk_id: int, token: str) -> bool:
+    """
+    Heartbeat: restart the lease if this claim still owns the chunk.
+    False → it was reclaimed by another worker; stop processing it.
+    """
+
+    result = db.execute(
+        update(SweepChunk)
+        .where(_owned(chunk_id, token))
+        .values(claimed_at=datetime.utcnow())
+    )
+    db.commit()
+
+    return result.rowcount == 1
+
+
+def finish_chunk(db: Session, chunk_id: int, token: str) -> bool:
+    """Mark the chunk done; False if this claim no longer owns it."""
+
+    result = db.execute(
+        update(SweepChunk)
+        .where(_owned(chunk_id, token))
+        .values(status="done", finished_at=datetime.utcnow())
+    )
+    db.commit()
+
+    return result.rowcount == 1
+
+
+def cleanup_sweeps(db: Session, retention_days: int = SWEEP_RETENTION_DAYS):
+
+    db.execute(
+        delete(SweepChunk)
+        .where(SweepChunk.created_at < datetime.utcnow() - timedelta(days=retention_days))
+    )
+    db.commit()
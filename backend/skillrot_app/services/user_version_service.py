@@ -0,0 +1,46 @@
+from sqlalchemy import update, select
+from sqlalchemy.orm import Session
+from skillrot_app.models.user import User
+from skillrot_app.models.skill import Skill
+
+
+def bump_user_version(db: Session, user_id: int = None, skill_id: int = None):
+    """
+    Increment the user's data_version inside the caller's transaction.
+    Cached per-user payloads (dashboard) are keyed by this version,
+    so committing the write invalidates them in every worker.
+
+    Pass either the user_id or a skill_id owned by the user.
+    """
+
+    if user_id is not None:
+        condition = User.id == user_id
+    else:
+        condition = User.id == (
+            select(Skill.user_id)
+            .where(Skill.id == skill_id)
+            .scalar_subquery()
+        )
+
+    db.execute(
+        update(User)
+        .where(condition)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_user_versions_for_skills(db: Session, skill_ids: list):
+    """Bulk variant: bump every user owning one of the skills."""
+
+    if not skill_ids:
+        return
+
+    db.execute(
+        update(User)
+        .where(User.id.in_(
+            select(Skill.user_id).where(Skill.id.in_(skill_ids))
+        ))
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -1,14 +1,19 @@
 import requests
 from typing import Optional
-from urllib.parse import quote
+from skillrot_app.services.resource_cache_service import ResourceCache
 
-WIKI_SEARCH_URL = "https://en.wikipedia.org/w/api.php"
-WIKI_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+
+# 🔹 Search hits considered per lookup
+WIKI_CANDIDATES = 3
 
 HEADERS = {
     "User-Agent": "SkillRotApp/1.0 (skillrot@example.com)"
 }
 
+# 🔹 Two-tier cache (memory + shared table), keyed by normalized topic
+wikipedia_cache = ResourceCache("wikipedia")
+
 # 🔹 Common short forms expansion
 SHORT_FORM_MAP = {
     "ai": "artificial intelligence",
@@ -47,73 +52,78 @@ def is_relevant_page(title: str, summary: str) -> bool:
     return True
 
 
-def fetch_wikipedia_article(topic: str) -> Optional[dict]:
-    """
-    Fetch Wikipedia article for refined subtopic.
+def search_wikipedia_article(topic: str) -> Optional[dict]:
     """
+    Uncached lookup. None → no relevant article; raises on API /
+    network errors so they are not cached as a miss.
 
-    try:
-        topic = expand_short_forms(topic)
+    One request: generator=search yields the top hits and
+    prop=extracts|info adds each one's intro and URL, so relevance
+    filtering runs locally over all of them.
+    """
 
-        search_params = {
-            "action": "query",
-            "list": "search",
-            "srsearch": topic,
-            "format": "json"
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": 2,
+        "generator": "search",
+        "gsrsearch": topic,
+        "gsrlimit": WIKI_CANDIDATES,
+        "prop": "extracts|info",
+        "exintro": 1,
+        "explaintext": 1,
+        "exlimit": WIKI_CANDIDATES,
+        "inprop": "url"
+    }
+
+    response = requests.get(
+        WIKI_API_URL,
+        params=params,
+        headers=HEADERS,
+        timeout=5
+    )
+
+    if response.status_code != 200:
+        raise RuntimeError(f"Wikipedia search error: {response.status_code}")
+
+    pages = response.json().get("query", {}).get("pages", [])
+
+    # 🔥 Best search hit first
+    for page in sorted(pages, key=lambda p: p.get("index", 0)):
+
+        title = page.get("title")
+        # First paragraph of the intro, like the REST summary
+        summary = (page.get("extract") or "").strip().split("\n")[0]
+        url = page.get("fullurl")
+
+        if not title or not summary:
+            continue
+
+        if not is_relevant_page(title, summary):
+            continue
+
+        return {
+            "title": title,
+            "summary": summary,
+            "url": url,
+            "type": "article"
         }
 
-        search_response = requests.get(
-            WIKI_SEARCH_URL,
-            params=search_params,
-            headers=HEADERS,
-            timeout=5
-        )
-
-        if search_response.status_code != 200:
-            return None
-
-        search_data = search_response.json()
-        search_results = search_data.get("query", {}).get("search", [])
-
-        if not search_results:
-            return None
-
-        # 🔥 Try top 3 results
-        for result in search_results[:3]:
-            page_title = result["title"]
-            encoded_title = quote(page_title)
+    return None
 
-            summary_response = requests.get(
-                f"{WIKI_SUMMARY_URL}{encoded_title}",
-                headers=HEADERS,
-                timeout=5
-            )
 
-            if summary_response.status_code != 200:
-                continue
-
-            summary_data = summary_response.json()
-
-            title = summary_data.get("title")
-            summary = summary_data.get("extract")
-            url = summary_data.get("content_urls", {}) \
-                               .get("desktop", {}) \
-                               .get("page")
-
-            if not title or not summary:
-                continue
-
-            if not is_relevant_page(title, summary):
-                continue
+def fetch_wikipedia_article(topic: str) -> Optional[dict]:
+    """
+    Fetch Wikipedia article for refined subtopic.
+    """
 
-            return {
-                "title": title,
-                "summary": summary,
-                "url": url,
-                "type": "article"
-            }
+    try:
+        topic = expand_short_forms(topic)
 
-        return None
+        return wikipedia_cache.get_or_fetch(
+            topic,
+            lambda: search_wikipedia_article(topic)
+        )
 
     except Exception:
-        return None
\ No newline at end of file
+        return None
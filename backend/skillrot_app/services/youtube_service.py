@@ -1,93 +1,84 @@
 import os
 import requests
 from typing import List
-from datetime import datetime, timedelta
+from skillrot_app.services.resource_cache_service import ResourceCache, normalize_key
 
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
 
-# 🔹 In-memory cache
-youtube_cache = {}
+# 🔹 Hard safety cap (never exceed 3)
+MAX_VIDEOS = 3
 
-# 🔹 Cache TTL (minutes)
-CACHE_TTL_MINUTES = 60
+# 🔹 Two-tier cache (memory + shared table), keyed by normalized topic
+youtube_cache = ResourceCache("youtube")
 
 
 def normalize_query(query: str) -> str:
     """
     Normalize query to avoid duplicate similar calls.
     """
-    return query.strip().lower()
+    return normalize_key(query)
 
 
-def fetch_youtube_videos(query: str, max_results: int = 3) -> List[dict]:
-
-    if not YOUTUBE_API_KEY:
-        print("YouTube API key missing.")
-        return []
-
-    normalized_query = normalize_query(query)
-    now = datetime.utcnow()
-
-    # 🔹 Check cache
-    if normalized_query in youtube_cache:
-        cached_entry = youtube_cache[normalized_query]
-
-        if cached_entry["expires"] > now:
-            return cached_entry["data"]
-        else:
-            del youtube_cache[normalized_query]
+def search_youtube_videos(query: str) -> List[dict]:
+    """
+    Uncached search. Raises on API / network errors so they are not
+    cached as "no videos".
+    """
 
     params = {
         "part": "snippet",
         "q": query,
         "type": "video",
-        "maxResults": max_results,
+        "maxResults": MAX_VIDEOS,
         "order": "relevance",
         "videoEmbeddable": "true",
         "safeSearch": "moderate",
         "key": YOUTUBE_API_KEY,
     }
 
-    try:
-        response = requests.get(
-            YOUTUBE_SEARCH_URL,
-            params=params,
-            timeout=5
-        )
+    response = requests.get(
+        YOUTUBE_SEARCH_URL,
+        params=params,
+        timeout=5
+    )
+
+    if response.status_code != 200:
+        raise RuntimeError(f"YouTube API error: {response.status_code}")
 
-        if response.status_code != 200:
-            print("YouTube API error:", response.status_code)
-            return []
+    data = response.json()
+    results = []
 
-        data = response.json()
-        results = []
+    for item in data.get("items", []):
+        video_id = item.get("id", {}).get("videoId")
+        snippet = item.get("snippet", {})
 
-        for item in data.get("items", []):
-            video_id = item.get("id", {}).get("videoId")
-            snippet = item.get("snippet", {})
+        if not video_id:
+            continue
 
-            if not video_id:
-                continue
+        results.append({
+            "title": snippet.get("title"),
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "channel": snippet.get("channelTitle"),
+            "type": "video"
+        })
 
-            results.append({
-                "title": snippet.get("title"),
-                "url": f"https://www.youtube.com/watch?v={video_id}",
-                "channel": snippet.get("channelTitle"),
-                "type": "video"
-            })
+    return results[:MAX_VIDEOS]
 
-        # 🔹 Hard safety cap (never exceed 3)
-        results = results[:3]
 
-        # 🔹 Store in cache
-        youtube_cache[normalized_query] = {
-            "data": results,
-            "expires": now + timedelta(minutes=CACHE_TTL_MINUTES)
-        }
+def fetch_youtube_videos(query: str, max_results: int = 3) -> List[dict]:
+
+    if not YOUTUBE_API_KEY:
+        print("YouTube API key missing.")
+        return []
 
-        return results
+    try:
+        results = youtube_cache.get_or_fetch(
+            query,
+            lambda: search_youtube_videos(query)
+        )
+        return results[:max_results]
 
     except Exception as e:
         print("YouTube fetch exception:", e)
-        return []
\ No newline at end of file
+        return []